@@ -1,2 +1,21 @@
-from expected_signaling_probability.utils.math import expected_signaling_probability
 from expected_signaling_probability.utils.directions import Direction
+import importlib
+
+# Public names resolved on first access, so importing the package does not import qutip, scipy or pandas.
+_LAZY_ATTRIBUTES = {
+    "expected_signaling_probability": "expected_signaling_probability.utils.math",
+}
+
+__all__ = ["Direction", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
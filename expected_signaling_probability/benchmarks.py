@@ -0,0 +1,245 @@
+from expected_signaling_probability.utils.lazy import lazy_import
+from expected_signaling_probability.utils.params import DEFAULT_EXTRA_PARAMS, ComputeParams
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.data_layers import DataLayer, table_key
+from expected_signaling_probability.utils.artifacts import ARTIFACTS
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, asdict
+from pathlib import Path
+import numpy as np
+import itertools
+import platform
+import tempfile
+import time
+import json
+import os
+
+qt = lazy_import("qutip")
+
+# Benchmarks of the estimator hot paths. A run writes a JSON file of median/min seconds per benchmark key, e.g.
+# "sample/kraus dA=2 dB=3", and `compare` flags keys that got slower than a baseline by more than a threshold.
+# Timings are machine-specific, so compare against a baseline recorded on the same machine.
+
+BASELINES_DIR = Path("benchmarks")
+DEFAULT_DIMS = tuple(range(2, 21))
+# Largest d_A·d_B benchmarked by default: the asymmetric experiments run d_A ≤ 20 with d_B = 2, and a full-rank global
+# channel of (d_A·d_B)⁴ entries is 41 MB at d_A·d_B = 40. --max-dim lowers it for quicker runs.
+DEFAULT_MAX_DIM = 40
+DEFAULT_THRESHOLD = 0.25
+BATCH_SIZE = 64
+BATCH_MAX_BYTES = 256 * 2**20  # fewer seeds per batch where BATCH_SIZE full-rank Kraus channels would exceed this
+
+
+@dataclass
+class Timing:
+    median: float  # seconds per call
+    min: float
+    repeats: int
+
+
+def time_call(fn: Callable[..., object], setup: Callable[[int], tuple] = lambda i: (), min_time: float = 0.2, min_repeats: int = 3, max_repeats: int = 200) -> Timing:
+    # Calls fn(*setup(i)) for i = 1, 2, ... until `min_time` seconds have been spent in fn; setup is not timed.
+    fn(*setup(0))  # warm-up (imports, BLAS initialisation, caches)
+    times: list[float] = []
+    while len(times) < max_repeats and (len(times) < min_repeats or sum(times) < min_time):
+        args = setup(len(times) + 1)
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return Timing(float(np.median(times)), float(np.min(times)), len(times))
+
+
+def dimension_pairs(dims: Iterable[int] = DEFAULT_DIMS, max_dim: int = DEFAULT_MAX_DIM) -> list[tuple[int, int]]:
+    return [(d_A, d_B) for d_A, d_B in itertools.product(dims, repeat=2) if d_A * d_B <= max_dim]
+
+
+def _sample_benchmarks(d_A: int, d_B: int, min_time: float) -> dict[str, Timing]:
+    # Per-sample latency of _one_shot_signaling_probability per engine, and per-sample time of the batched kernels.
+    from expected_signaling_probability.utils.math import _one_shot_signaling_probability, _draw_signaling_probability_batch
+
+    timings = {}
+    for engine in Engine:
+        compute_params = ComputeParams(engine=engine)
+        timings[f"sample/{engine.value}"] = time_call(
+            lambda seed: _one_shot_signaling_probability(d_A, d_B, Direction.A_TO_B, seed, None, DEFAULT_EXTRA_PARAMS, compute_params),
+            lambda i: (i + 1,),
+            min_time,
+        )
+    batch_size = max(1, min(BATCH_SIZE, BATCH_MAX_BYTES // (16 * (d_A * d_B) ** 4)))
+    batch = time_call(
+        lambda seeds: _draw_signaling_probability_batch(d_A, d_B, Direction.A_TO_B, seeds, DEFAULT_EXTRA_PARAMS),
+        lambda i: (np.arange(i * batch_size + 1, (i + 1) * batch_size + 1),),
+        min_time,
+    )
+    timings["sample/batch"] = Timing(batch.median / batch_size, batch.min / batch_size, batch.repeats)
+    return timings
+
+
+def _phase_benchmarks(d_A: int, d_B: int, min_time: float) -> dict[str, Timing]:
+    # One sample of ⟨S⟩_{A→B} split into its phases, for both engines (the Kraus engine fuses ℰ and Tr_A).
+    from expected_signaling_probability.utils import math
+
+    direction, extra_params = Direction.A_TO_B, DEFAULT_EXTRA_PARAMS
+    keep = direction.to_ptrace_index()
+
+    def qutip_inputs(seed: int) -> tuple:
+        rho = math.generate_random_dm(d_A, d_B, seed, extra_params)
+        local_operation = math.generate_random_local_channel(d_A, d_B, direction, seed, extra_params)
+        superoperator = math.generate_random_superoperator(d_A, d_B, seed, extra_params)
+        difference = rho - local_operation(rho)
+        final_difference = superoperator(difference)
+        return rho, local_operation, superoperator, difference, final_difference, qt.ptrace(final_difference, keep)
+
+    def kraus_inputs(seed: int) -> tuple:
+        rho = math.generate_random_dm_array(d_A, d_B, seed, extra_params)
+        local_channel = math.generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params)
+        global_channel = math.generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+        difference = rho - local_channel(rho)
+        return rho, local_channel, global_channel, difference, global_channel.reduced(difference, d_A, d_B, keep)
+
+    qutip_cases = {
+        "state_draw": (lambda seed: math.generate_random_dm(d_A, d_B, seed, extra_params), lambda i: (i + 1,)),
+        "local_op_draw": (lambda seed: math.generate_random_local_channel(d_A, d_B, direction, seed, extra_params), lambda i: (i + 1,)),
+        "channel_draw": (lambda seed: math.generate_random_superoperator(d_A, d_B, seed, extra_params), lambda i: (i + 1,)),
+        "local_op": (lambda rho, local_operation: local_operation(rho), lambda i: qutip_inputs(i + 1)[:2]),
+        "channel_application": (lambda superoperator, difference: superoperator(difference), lambda i: qutip_inputs(i + 1)[2:4]),
+        "ptrace": (lambda final_difference: qt.ptrace(final_difference, keep), lambda i: qutip_inputs(i + 1)[4:5]),
+        "tracedist": (lambda reduced: 0.5 * math.trace_norm(reduced.full()), lambda i: qutip_inputs(i + 1)[5:]),
+    }
+    kraus_cases = {
+        "state_draw": (lambda seed: math.generate_random_dm_array(d_A, d_B, seed, extra_params), lambda i: (i + 1,)),
+        "local_op_draw": (lambda seed: math.generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params), lambda i: (i + 1,)),
+        "channel_draw": (lambda seed: math.generate_random_kraus_channel(d_A, d_B, seed, extra_params), lambda i: (i + 1,)),
+        "local_op": (lambda rho, local_channel: local_channel(rho), lambda i: kraus_inputs(i + 1)[:2]),
+        "channel_application_ptrace": (lambda global_channel, difference: global_channel.reduced(difference, d_A, d_B, keep), lambda i: kraus_inputs(i + 1)[2:4]),
+        "tracedist": (lambda reduced: 0.5 * math.trace_norm(reduced), lambda i: kraus_inputs(i + 1)[4:]),
+    }
+
+    timings = {}
+    for engine, cases in [(Engine.QUTIP, qutip_cases), (Engine.KRAUS, kraus_cases)]:
+        for phase, (fn, setup) in cases.items():
+            timings[f"phase/{engine.value}/{phase}"] = time_call(fn, setup, min_time)
+    return timings
+
+
+def _support_benchmarks(min_time: float) -> dict[str, Timing]:
+    from expected_signaling_probability.utils.caching import Cache
+    from expected_signaling_probability.utils.stats import statistics
+    from expected_signaling_probability.utils.fitting import fit_power_law
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as root:
+        cache = Cache("S", root=root)
+        key = (2, 2, Direction.A_TO_B)
+        timings["cache/set"] = time_call(lambda seed: cache.set(*key, seed, 0.5, DEFAULT_EXTRA_PARAMS), lambda i: (i + 1,), min_time)
+        timings["cache/get"] = time_call(lambda seed: cache.get(*key, seed, DEFAULT_EXTRA_PARAMS), lambda i: (i % 200 + 1,), min_time)
+        cache.close()
+        cache.wait()
+
+    samples = np.random.default_rng(0).random(100_000)
+    for retention in (SampleRetention.ALL, SampleRetention.HISTOGRAM):
+        timings[f"statistics/{retention.value} n=100000"] = time_call(
+            lambda: statistics(samples, retention, d_A=2, d_B=2, direction=Direction.A_TO_B), min_time=min_time
+        )
+
+    x = np.arange(2.0, 17.0)
+    y = 0.3 * x**-1.5
+    timings["fit_power_law n=15"] = time_call(lambda: fit_power_law(x, y), min_time=min_time)
+    return timings
+
+
+def data_layer_timings(d_A: int, d_B: int, min_time: float = 0.05) -> dict[str, dict[DataLayer, Timing]]:
+    # Per-sample time of each operator of the QuTiP engine in each data layer, keyed like the autotuning table. The
+    # global superoperator is drawn in its layer, so only its application is timed; a local operation is drawn for
+    # every seed, so building its CSR super_tensor (once per LocalSuperoperator) counts as well.
+    from expected_signaling_probability.utils.math import generate_random_dm, generate_random_local_channel
+    from expected_signaling_probability.utils.superoperators import LocalSuperoperator
+
+    rho = generate_random_dm(d_A, d_B, 1)
+    superoperator = qt.rand_super_bcsz([d_A, d_B], seed=1)
+    timings = {table_key("global", d_A, d_B): {layer: time_call(superoperator.to(layer.value), lambda i: (rho,), min_time) for layer in DataLayer}}
+    for direction in Direction:
+        local_operation = generate_random_local_channel(d_A, d_B, direction, 1)
+        role = "local_A" if local_operation.subsystem == 0 else "local_B"
+        timings[table_key(role, d_A, d_B)] = {
+            layer: time_call(lambda: LocalSuperoperator(local_operation.superoperator, d_A, d_B, local_operation.subsystem, layer)(rho), min_time=min_time) for layer in DataLayer
+        }
+    return timings
+
+
+def autotune_data_layers(pairs: list[tuple[int, int]], min_time: float = 0.05, progress: Callable[[str], None] | None = None) -> dict[str, DataLayer]:
+    # The fastest data layer of each operator of each pair, as read by utils/data_layers.py.
+    table = {}
+    for d_A, d_B in pairs:
+        if progress is not None:
+            progress(f"dA={d_A} dB={d_B}")
+        for key, layer_timings in data_layer_timings(d_A, d_B, min_time).items():
+            table[key] = min(layer_timings, key=lambda layer: layer_timings[layer].min)
+    return table
+
+
+def run_benchmarks(pairs: list[tuple[int, int]], min_time: float = 0.2, phases: bool = True, progress: Callable[[str], None] | None = None) -> dict[str, Timing]:
+    # Benchmarks reuse seeds, so the artifact cache is off: every call draws afresh, as for new seeds.
+    max_bytes = ARTIFACTS.max_bytes
+    ARTIFACTS.resize(0)
+    try:
+        timings = _support_benchmarks(min_time)
+        for d_A, d_B in pairs:
+            if progress is not None:
+                progress(f"dA={d_A} dB={d_B}")
+            pair_timings = _sample_benchmarks(d_A, d_B, min_time)
+            if phases:
+                pair_timings |= _phase_benchmarks(d_A, d_B, min_time)
+            timings |= {f"{name} dA={d_A} dB={d_B}": timing for name, timing in pair_timings.items()}
+    finally:
+        ARTIFACTS.resize(max_bytes)
+    return timings
+
+
+def _environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "qutip": qt.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def write_results(path: Path, timings: dict[str, Timing]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    results = {"environment": _environment(), "timings": {name: asdict(timing) for name, timing in timings.items()}}
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Path) -> dict[str, Timing]:
+    return {name: Timing(**timing) for name, timing in json.loads(Path(path).read_text())["timings"].items()}
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def compare(baseline: dict[str, Timing], current: dict[str, Timing], threshold: float = DEFAULT_THRESHOLD) -> tuple[list[Comparison], list[Comparison]]:
+    # (regressions, improvements) among the keys of both runs. Compares the fastest call, which is far less sensitive
+    # to other load on the machine than the median: a key regresses when it exceeds the baseline by more than
+    # `threshold` (relative), and improves when it is that much faster.
+    regressions, improvements = [], []
+    for name in sorted(baseline.keys() & current.keys()):
+        comparison = Comparison(name, baseline[name].min, current[name].min)
+        if comparison.ratio > 1 + threshold:
+            regressions.append(comparison)
+        elif comparison.ratio < 1 / (1 + threshold):
+            improvements.append(comparison)
+    return regressions, improvements
@@ -0,0 +1,146 @@
+from expected_signaling_probability.utils.spec import SweepSpec, Geometry, load_spec, load_summary, write_summary
+from expected_signaling_probability.utils.sweep import run_sweep
+from expected_signaling_probability.utils.manifest import Manifest
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.stats import Stats
+from expected_signaling_probability.utils import data_layers
+from expected_signaling_probability import benchmarks
+from dataclasses import replace
+from pathlib import Path
+import argparse
+import sys
+
+RESULTS_DIR = Path("results")
+
+
+def run(spec: SweepSpec, output: Path) -> list[Stats]:
+    # The summary is rewritten as cells finish, and a checkpoint manifest next to it records finished cells, so
+    # rerunning an interrupted spec skips finished cells; the others resume from the seeds in the per-seed cache.
+    cells = spec.cells()
+    manifest = Manifest(output.with_suffix(".manifest.jsonl"))
+    results = []
+    for cell, stats in run_sweep(cells, spec.compute_params, manifest=manifest):
+        results.append((cell, stats))
+        results.sort(key=lambda result: cells.index(result[0]))
+        write_summary(output, spec, results)
+        print(f"[run] {cell.quantity.value} d_A={cell.d_A} d_B={cell.d_B} {cell.direction.to_str()}: mean={stats.mean:.6g} (n={stats.n})")
+    manifest.compact()
+    return [stats for _, stats in results]
+
+
+def plot(spec: SweepSpec, all_stats: list[Stats], save: bool = True) -> None:
+    from expected_signaling_probability.utils.plotting import PlotMode
+
+    mode = PlotMode(spec.plot_mode)
+    if spec.geometry == Geometry.SYMMETRIC:
+        if spec.quantity != Quantity.SIGNALING:
+            raise ValueError("Only symmetric signaling sweeps have a plot")
+        from expected_signaling_probability.experiments.symmetric_expected_signaling_probability import plot_symmetric_expected_signaling_probability
+
+        plot_symmetric_expected_signaling_probability(sorted(all_stats, key=lambda s: s.d_A), save=save, d_fit_min=spec.d_fit_min, mode=mode)
+        return
+
+    by_direction = {direction: sorted((s for s in all_stats if s.direction == direction), key=lambda s: s.d_A) for direction in Direction}
+    if not all(by_direction.values()):
+        raise ValueError("Asymmetric plots need both directions")
+    all_stats_A_to_B, all_stats_B_to_A = by_direction[Direction.A_TO_B], by_direction[Direction.B_TO_A]
+    if spec.quantity == Quantity.SIGNALING:
+        from expected_signaling_probability.experiments.asymmetric_expected_signaling_probability import plot_asymmetric_expected_signaling_probability
+
+        plot_asymmetric_expected_signaling_probability(all_stats_A_to_B, all_stats_B_to_A, d_B=spec.d_B, save=save, d_fit_min=spec.d_fit_min, mode=mode)
+    elif spec.quantity == Quantity.TRANSMISSION:
+        from expected_signaling_probability.experiments.extra.asymmetric_expected_transmission_probability import plot_asymmetric_expected_transmission_probability
+
+        plot_asymmetric_expected_transmission_probability(all_stats_A_to_B, all_stats_B_to_A, save=save, d_fit_min=spec.d_fit_min, mode=mode)
+    else:
+        from expected_signaling_probability.experiments.extra.asymmetric_expected_correlation_probability import plot_asymmetric_expected_correlation_probability
+
+        plot_asymmetric_expected_correlation_probability(all_stats_A_to_B, all_stats_B_to_A, save=save, d_fit_min=spec.d_fit_min, mode=mode)
+
+def bench(args: argparse.Namespace) -> int:
+    if args.bench_command == "autotune":
+        table = data_layers.load_table(args.output) | benchmarks.autotune_data_layers(benchmarks.dimension_pairs(args.dims, args.max_dim), args.min_time, progress=lambda pair: print(f"[bench] {pair}"))
+        data_layers.write_table(table, args.output)
+        print(f"[bench] {sum(layer == data_layers.DataLayer.CSR for layer in table.values())} of {len(table)} operators in CSR, written to {args.output}")
+        return 0
+
+    if args.bench_command == "run":
+        pairs = benchmarks.dimension_pairs(args.dims, args.max_dim)
+        timings = benchmarks.run_benchmarks(pairs, args.min_time, phases=not args.no_phases, progress=lambda pair: print(f"[bench] {pair}"))
+        benchmarks.write_results(args.output, timings)
+        print(f"[bench] {len(timings)} timings written to {args.output}")
+        if args.baseline is None:
+            return 0
+        baseline, current = benchmarks.load_results(args.baseline), timings
+    else:
+        baseline, current = benchmarks.load_results(args.baseline), benchmarks.load_results(args.current)
+
+    regressions, improvements = benchmarks.compare(baseline, current, args.threshold)
+    for label, comparisons in [("slower", regressions), ("faster", improvements)]:
+        for comparison in comparisons:
+            print(f"[bench] {label}: {comparison.name}: {comparison.baseline * 1e3:.3f} ms -> {comparison.current * 1e3:.3f} ms ({comparison.ratio:.2f}x)")
+    print(f"[bench] {len(regressions)} regressions beyond {args.threshold:.0%} in {len(baseline.keys() & current.keys())} shared timings")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="esp", description="Run expected signaling probability sweeps from a TOML/JSON spec.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="compute a sweep and write its JSON summary")
+    run_parser.add_argument("spec", type=Path)
+    run_parser.add_argument("-o", "--output", type=Path, help=f"summary file (default: {RESULTS_DIR}/<spec name>.json)")
+    run_parser.add_argument("-j", "--n-workers", type=int, help="override the spec's n_workers")
+    run_parser.add_argument("--plot", action="store_true", help="plot the summary once the sweep is done")
+
+    plot_parser = subparsers.add_parser("plot", help="plot a summary written by `run`")
+    plot_parser.add_argument("summary", type=Path)
+    plot_parser.add_argument("--mode", choices=["explore", "paper"], help="override the spec's plot_mode")
+    plot_parser.add_argument("--no-save", action="store_true")
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark the estimator hot paths against JSON baselines")
+    bench_subparsers = bench_parser.add_subparsers(dest="bench_command", required=True)
+    bench_run_parser = bench_subparsers.add_parser("run", help="time the benchmarks and write them as JSON")
+    bench_run_parser.add_argument("-o", "--output", type=Path, default=benchmarks.BASELINES_DIR / "latest.json")
+    bench_run_parser.add_argument("--dims", type=int, nargs="+", default=list(benchmarks.DEFAULT_DIMS), help="values of d_A and d_B to combine")
+    bench_run_parser.add_argument("--max-dim", type=int, default=benchmarks.DEFAULT_MAX_DIM, help="skip pairs with d_A·d_B above this")
+    bench_run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent timing each benchmark")
+    bench_run_parser.add_argument("--no-phases", action="store_true", help="skip the per-phase breakdown")
+    bench_run_parser.add_argument("--baseline", type=Path, help="compare the run against this baseline")
+    bench_compare_parser = bench_subparsers.add_parser("compare", help="compare two benchmark files")
+    bench_compare_parser.add_argument("baseline", type=Path)
+    bench_compare_parser.add_argument("current", type=Path)
+    bench_autotune_parser = bench_subparsers.add_parser("autotune", help="time each operator in each QuTiP data layer and record the fastest")
+    bench_autotune_parser.add_argument("-o", "--output", type=Path, default=data_layers.DEFAULT_TABLE)
+    bench_autotune_parser.add_argument("--dims", type=int, nargs="+", default=list(benchmarks.DEFAULT_DIMS), help="values of d_A and d_B to combine")
+    bench_autotune_parser.add_argument("--max-dim", type=int, default=benchmarks.DEFAULT_MAX_DIM, help="skip pairs with d_A·d_B above this")
+    bench_autotune_parser.add_argument("--min-time", type=float, default=0.05, help="seconds spent timing each layer")
+    for bench_subparser in (bench_run_parser, bench_compare_parser):
+        bench_subparser.add_argument("--threshold", type=float, default=benchmarks.DEFAULT_THRESHOLD, help="relative slowdown that counts as a regression")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return bench(args)
+
+    if args.command == "run":
+        spec = load_spec(args.spec)
+        if args.n_workers is not None:
+            spec = replace(spec, n_workers=args.n_workers)
+        output = args.output or RESULTS_DIR / f"{args.spec.stem}.json"
+        all_stats = run(spec, output)
+        print(f"[run] Summary written to {output}")
+        if args.plot:
+            plot(spec, all_stats)
+        return 0
+
+    spec, all_stats = load_summary(args.summary)
+    if args.mode is not None:
+        spec = replace(spec, plot_mode=args.mode)
+    plot(spec, all_stats, save=not args.no_save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,22 +9,27 @@ from expected_signaling_probability.utils.plotting import (
     plot_power_law_fit,
     save_plot,
 )
-from expected_signaling_probability.utils.math import expected_correlation_probability, Direction
-from expected_signaling_probability.utils.stats import statistics, Stats
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.params import ExtraParams, DEFAULT_EXTRA_PARAMS, ComputeParams, DEFAULT_COMPUTE_PARAMS
+from expected_signaling_probability.utils.sweep import compute_asymmetric_sweep
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.stats import Stats
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 
 
 def compute_asymmetric_expected_correlation_probability(
-    n_samples: int, d_A_min: int, d_A_max: int, d_B: int, direction: Direction,
+    n_samples: int,
+    d_A_min: int,
+    d_A_max: int,
+    d_B: int,
+    direction: Direction,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
 ) -> list[Stats]:
-    assert d_A_min <= d_A_max
-    all_stats = []
-    for d_A in range(d_A_min, d_A_max + 1):
-        samples = expected_correlation_probability(n_samples, d_A, d_B, direction)
-        stat = statistics(samples, d_A=d_A, d_B=d_B, direction=direction)
-        all_stats.append(stat)
-    return all_stats
+    return compute_asymmetric_sweep(Quantity.CORRELATION, n_samples, d_A_min, d_A_max, d_B, [direction], compute_params, extra_params)[direction]
 
 
 DIRECTION_STYLE: dict[Direction, tuple[str, str]] = {
@@ -53,7 +58,7 @@ def plot_asymmetric_expected_correlation_probability(
         y = np.array([s.mean for s in all_stats])
 
         plot_scatter(x, y, color=color, label=label)
-        plot_power_law_fit(x, y, color=color, probability_label=label, dim_var="d_A", d_fit_min=d_fit_min)
+        plot_power_law_fit(x, y, color=color, probability_label=label, dim_var="d_A", d_fit_min=d_fit_min, all_stats=all_stats)
         if use_error_bars:
             plot_error_bars(x, y, all_stats)
 
@@ -77,8 +82,12 @@ def main():
     d_A_max = 20
     d_B = 2
     d_fit_min = d_A_max // 2
-    all_stats_A_to_B = compute_asymmetric_expected_correlation_probability(n_samples, d_A_min, d_A_max, d_B, Direction.A_TO_B)
-    all_stats_B_to_A = compute_asymmetric_expected_correlation_probability(n_samples, d_A_min, d_A_max, d_B, Direction.B_TO_A)
+    compute_params = ComputeParams(n_workers=os.cpu_count(), sample_retention=SampleRetention.HISTOGRAM)
+
+    # Both directions in one sweep so that the whole figure shares the worker pool.
+    all_stats = compute_asymmetric_sweep(Quantity.CORRELATION, n_samples, d_A_min, d_A_max, d_B, [Direction.A_TO_B, Direction.B_TO_A], compute_params)
+    all_stats_A_to_B = all_stats[Direction.A_TO_B]
+    all_stats_B_to_A = all_stats[Direction.B_TO_A]
 
     plot_asymmetric_expected_correlation_probability(all_stats_A_to_B, all_stats_B_to_A, d_fit_min=d_fit_min)
 
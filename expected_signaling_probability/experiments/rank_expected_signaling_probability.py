@@ -0,0 +1,80 @@
+from expected_signaling_probability.utils.plotting import (
+    PlotMode,
+    apply_plot_style,
+    plot_title,
+    format_log_ticks,
+    LatexStrings,
+    plot_scatter,
+    plot_error_bars,
+    save_plot,
+)
+from expected_signaling_probability import Direction
+from expected_signaling_probability.utils.math import expected_signaling_probability_over_ranks
+from expected_signaling_probability.utils.params import ComputeParams, DEFAULT_COMPUTE_PARAMS
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.stats import Stats, statistics
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+
+
+def compute_rank_expected_signaling_probability(
+    n_samples: int, d_A: int, d_B: int, direction: Direction, compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+) -> dict[int, Stats]:
+    # Every global channel rank 1..(d_A·d_B)², from one draw of ρ, 𝒜 and ℰ per seed.
+    samples = expected_signaling_probability_over_ranks(n_samples, d_A, d_B, direction, compute_params=compute_params)
+    return {rank: statistics(tr_dists, compute_params.sample_retention, d_A=d_A, d_B=d_B, direction=direction) for rank, tr_dists in samples.items()}
+
+
+DIRECTION_STYLE: dict[Direction, tuple[str, str]] = {
+    Direction.A_TO_B: (LatexStrings.EXPECTED_SIGNALING_PROBABILITY_A_TO_B, "blue"),
+    Direction.B_TO_A: (LatexStrings.EXPECTED_SIGNALING_PROBABILITY_B_TO_A, "red"),
+}
+
+
+def plot_rank_expected_signaling_probability(
+    all_stats: dict[Direction, dict[int, Stats]],
+    use_error_bars: bool = True,
+    save: bool = True,
+    mode: PlotMode = PlotMode.EXPLORE,
+):
+    apply_plot_style(mode)
+    plt.figure()
+
+    for direction, stats_by_rank in all_stats.items():
+        label, color = DIRECTION_STYLE[direction]
+        x = np.array(list(stats_by_rank))
+        y = np.array([s.mean for s in stats_by_rank.values()])
+
+        plot_scatter(x, y, color=color, label=label)
+        if use_error_bars:
+            plot_error_bars(x, y, list(stats_by_rank.values()))
+
+    first = next(iter(next(iter(all_stats.values())).values()))
+    plt.xscale("log")
+    format_log_ticks()
+    plt.xlabel(r"$\mathrm{rank}(\mathcal{E})$")
+    plt.ylabel(LatexStrings.EXPECTED_SIGNALING_PROBABILITY_X_TO_Y)
+    plot_title(rf"Expected Signaling Probability by Channel Rank ($d_A =$ {first.d_A}, $d_B =$ {first.d_B}, $N =$ {LatexStrings.n_samples_to_sci(first.n)})")
+    plt.legend()
+    plt.tight_layout()
+
+    if save:
+        save_plot("rank_expected_signaling_probability")
+    plt.show()
+
+
+def main():
+    n_samples = 1_000
+    d_A = 3
+    d_B = 2
+    plot_mode = PlotMode.PAPER
+
+    compute_params = ComputeParams(batch_size=100, n_workers=os.cpu_count(), sample_retention=SampleRetention.HISTOGRAM)
+    all_stats = {direction: compute_rank_expected_signaling_probability(n_samples, d_A, d_B, direction, compute_params) for direction in Direction}
+
+    plot_rank_expected_signaling_probability(all_stats, mode=plot_mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,20 +9,22 @@ from expected_signaling_probability.utils.plotting import (
     plot_power_law_fit,
     save_plot,
 )
-from expected_signaling_probability import expected_signaling_probability, Direction
-from expected_signaling_probability.utils.stats import statistics, Stats
+from expected_signaling_probability import Direction
+from expected_signaling_probability.utils.params import ComputeParams, DEFAULT_COMPUTE_PARAMS
+from expected_signaling_probability.utils.sweep import SweepCell, compute_sweep
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.stats import Stats
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 
 
-def compute_symmetric_expected_signaling_probability(n_samples: int, d_min: int, d_max: int) -> list[Stats]:
+def compute_symmetric_expected_signaling_probability(n_samples: int, d_min: int, d_max: int, compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS) -> list[Stats]:
     assert d_min <= d_max
-    all_stats = []
-    for d in range(d_min, d_max + 1):
-        samples = expected_signaling_probability(n_samples, d, d, Direction.A_TO_B)
-        stat = statistics(samples, d_A=d, d_B=d, direction=Direction.A_TO_B)
-        all_stats.append(stat)
-    return all_stats
+    cells = [SweepCell(Quantity.SIGNALING, d, d, Direction.A_TO_B, n_samples) for d in range(d_min, d_max + 1)]
+    return compute_sweep(cells, compute_params)
 
 
 def plot_symmetric_expected_signaling_probability(
@@ -39,7 +41,7 @@ def plot_symmetric_expected_signaling_probability(
 
     label = LatexStrings.SYMMETRIC_EXPECTED_SIGNALING_PROBABILITY
     plot_scatter(x, y, color="purple", label=label)
-    plot_power_law_fit(x, y, color="purple", probability_label=label, dim_var="d", d_fit_min=d_fit_min)
+    plot_power_law_fit(x, y, color="purple", probability_label=label, dim_var="d", d_fit_min=d_fit_min, all_stats=all_stats)
     if use_error_bars:
         plot_error_bars(x, y, all_stats)
 
@@ -61,7 +63,8 @@ def main():
     n_samples = 1_000
     d_min = 2
     d_max = 10
-    all_stats = compute_symmetric_expected_signaling_probability(n_samples, d_min, d_max)
+    compute_params = ComputeParams(engine=Engine.KRAUS, n_workers=os.cpu_count(), sample_retention=SampleRetention.HISTOGRAM)
+    all_stats = compute_symmetric_expected_signaling_probability(n_samples, d_min, d_max, compute_params)
 
     plot_mode = PlotMode.PAPER
     d_fit_min = d_max // 2
@@ -0,0 +1,115 @@
+from expected_signaling_probability.utils import instrumentation
+from collections.abc import Callable
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+import inspect
+
+# In-memory, per-process store of the random objects drawn for a seed (states, local and global channels), so that
+# estimators of different quantities on the same seeds draw each object once: ⟨S⟩ and ⟨T⟩ share ρ and ℰ, ⟨T⟩ and ⟨C⟩
+# share both states. Entries are evicted least recently used first once they exceed `max_bytes`.
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def nbytes(value: object) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "operators"):  # KrausChannel, LocalKrausChannel
+        return value.operators.nbytes  # type: ignore[attr-defined]
+    if hasattr(value, "superoperator"):  # LocalSuperoperator, with its tensored superoperator in the CSR layer
+        tensored = getattr(value, "_tensored", None)
+        return nbytes(value.superoperator) + (0 if tensored is None else nbytes(tensored))  # type: ignore[attr-defined]
+    data = value.data  # type: ignore[attr-defined]  # a Qobj
+    if type(data).__name__ == "CSR":
+        matrix = data.as_scipy()
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return int(np.prod(value.shape)) * 16  # type: ignore[attr-defined]
+
+
+class ArtifactCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes  # 0 disables the cache
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> object | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            instrumentation.count("artifact_misses")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        instrumentation.count("artifact_hits")
+        return entry[0]
+
+    def put(self, key: tuple, value: object) -> None:
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def resize(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+ARTIFACTS = ArtifactCache()
+
+
+def _hashable(value: object) -> object:
+    return tuple(value.tolist()) if isinstance(value, np.ndarray) else value
+
+
+def cached_artifact(generator: Callable) -> Callable:
+    # For the generators of utils/math.py, whose draws depend on their arguments only: a call with the same
+    # arguments (d_A, d_B, seed or seeds, direction, ExtraParams with the ranks, component) returns the stored draw.
+    # Draws without a seed are not stored. Stored draws are shared by every caller: arrays are made read-only, and
+    # Qobj and LocalSuperoperator draws must not be mutated in place either (QuTiP arithmetic returns new objects).
+    signature = inspect.signature(generator)
+    assert all(parameter.kind == parameter.POSITIONAL_OR_KEYWORD for parameter in signature.parameters.values())
+    names = tuple(signature.parameters)
+    defaults = tuple(parameter.default for parameter in signature.parameters.values())
+    seed_index = next(i for i, name in enumerate(names) if name in ("seed", "seeds"))
+
+    @wraps(generator)
+    def wrapper(*args, **kwargs):
+        if ARTIFACTS.max_bytes == 0:
+            return generator(*args, **kwargs)
+        # Every call as its full positional tuple with the defaults filled in, as bind() and apply_defaults() would
+        # give, so that f(3, 2, 5), f(3, 2, seed=5) and f(3, 2, 5, DEFAULT_EXTRA_PARAMS) share a key.
+        full_args = args + tuple(kwargs.pop(name, default) for name, default in zip(names[len(args) :], defaults[len(args) :]))
+        if kwargs or any(arg is inspect.Parameter.empty for arg in full_args):
+            signature.bind(*args, **kwargs)  # raises the TypeError of the call
+        if full_args[seed_index] is None:
+            return generator(*full_args)
+
+        key = (generator, *map(_hashable, full_args))
+        if (artifact := ARTIFACTS.get(key)) is not None:
+            return artifact
+        artifact = generator(*full_args)
+        for array in (artifact, getattr(artifact, "operators", None)):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        ARTIFACTS.put(key, artifact)
+        return artifact
+
+    return wrapper
@@ -0,0 +1,90 @@
+from expected_signaling_probability.utils.fitting import fit_power_laws
+from expected_signaling_probability.utils.stats import Stats
+from dataclasses import dataclass
+import numpy as np
+
+DEFAULT_REPLICATES = 10_000
+DEFAULT_MAX_BYTES = 64 * 2**20  # peak size of one chunk's index matrix and gathered samples
+
+
+@dataclass
+class BootstrapFit:
+    # Power law y = prefactor · x^slope fitted to each replicate's resampled means (see fit_power_laws).
+    slope: float  # of the fit to the observed means
+    prefactor: float
+    slope_se: float  # standard deviation over the replicates
+    slope_ci: tuple[float, float]  # percentile interval at `confidence`
+    prefactor_ci: tuple[float, float]
+    confidence: float
+    n_replicates: int
+    slopes: np.typing.NDArray
+    intercepts: np.typing.NDArray  # log10 of the prefactors
+
+
+def can_resample(stats: Stats) -> bool:
+    return len(stats.samples) == stats.n or stats.histogram is not None
+
+
+def resampling_samples(stats: Stats) -> np.typing.NDArray:
+    # The cell's samples, or for compact Stats its histogram expanded to bin centres (a bin-width approximation).
+    if len(stats.samples) == stats.n:
+        return stats.samples
+    if stats.histogram is None:
+        raise ValueError(f"Bootstrapping needs the samples or a histogram of the cell (d_A={stats.d_A}, d_B={stats.d_B}); compute it with SampleRetention.ALL or HISTOGRAM")
+    counts, edges = stats.histogram
+    return np.repeat((edges[:-1] + edges[1:]) / 2, counts)
+
+
+def bootstrap_means(
+    samples: list[np.typing.NDArray],
+    n_replicates: int = DEFAULT_REPLICATES,
+    seed: int = 0,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> np.typing.NDArray:
+    # (n_replicates, len(samples)) means of each cell's samples resampled with replacement. Replicates are drawn in
+    # chunks of an (n_chunk, n_cell) index matrix sized to `max_bytes`; every cell has its own stream, so the
+    # result does not depend on the chunk size.
+    means = np.empty((n_replicates, len(samples)))
+    for j, cell_samples in enumerate(samples):
+        generator = np.random.default_rng([seed, j])
+        n = len(cell_samples)
+        chunk_size = max(1, max_bytes // (16 * n))  # int64 indices and float64 gathered values
+        for start in range(0, n_replicates, chunk_size):
+            stop = min(start + chunk_size, n_replicates)
+            idx = generator.integers(0, n, size=(stop - start, n))
+            means[start:stop, j] = cell_samples[idx].mean(axis=1)
+    return means
+
+
+def bootstrap_power_law(
+    all_stats: list[Stats],
+    n_replicates: int = DEFAULT_REPLICATES,
+    confidence: float = 0.95,
+    seed: int = 0,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    weighted: bool = True,
+) -> BootstrapFit:
+    # Fit of ⟨·⟩ against d_A, with its uncertainty from the Monte-Carlo error of every cell's mean. The observed
+    # and all replicate fits are one stacked solve, weighted by the cells' standard errors unless `weighted` is False.
+    x = np.array([s.d_A for s in all_stats], dtype=float)
+    observed = np.array([s.mean for s in all_stats], dtype=float)
+    means = bootstrap_means([resampling_samples(s) for s in all_stats], n_replicates, seed, max_bytes)
+    sem = np.array([s.sem for s in all_stats]) if weighted else None
+    fits = fit_power_laws(x, np.concatenate([observed[None], means]), sem)
+    slope, intercept = fits.slope[0], fits.intercept[0]
+    slopes, intercepts = fits.slope[1:], fits.intercept[1:]
+
+    alpha = (1 - confidence) / 2
+    slope_ci = np.quantile(slopes, [alpha, 1 - alpha])
+    intercept_ci = np.quantile(intercepts, [alpha, 1 - alpha])
+    return BootstrapFit(
+        slope=float(slope),
+        prefactor=float(10**intercept),
+        slope_se=float(np.std(slopes, ddof=1)),
+        slope_ci=(float(slope_ci[0]), float(slope_ci[1])),
+        prefactor_ci=(float(10 ** intercept_ci[0]), float(10 ** intercept_ci[1])),
+        confidence=confidence,
+        n_replicates=n_replicates,
+        slopes=slopes,
+        intercepts=intercepts,
+    )
@@ -1,95 +1,323 @@
 from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.stats import Stats, statistics
+from expected_signaling_probability.utils.retention import SampleRetention
 from expected_signaling_probability.utils.params import ExtraParams
+from expected_signaling_probability.utils.instrumentation import timed, count
 from dataclasses import fields
+from enum import Enum
 from pathlib import Path
-import pandas as pd
+import numpy as np
+import threading
+import json
+import os
+
+
+# One fixed-width (seed, value) record per sample; files are raw arrays of these.
+RECORD_DTYPE = np.dtype([("seed", "<i8"), ("value", "<f8")])
+
+
+def make_key(label: str, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams) -> str:
+    # e.g. "S dA=2 dB=3 direction=AtoB superoperator_rank=4"; ExtraParams fields left at None are omitted.
+    key_parts = [f"{label}", f"dA={d_A}", f"dB={d_B}", f"direction={direction.to_str()}"]
+
+    for field in fields(extra_params):
+        value = getattr(extra_params, field.name)
+        if isinstance(value, Enum):
+            value = value.value
+        if value is not None:
+            key_parts.append(f"{field.name}={value}")
+
+    return " ".join(key_parts)
 
 
 class Cache:
-    def __init__(self, label: str):
+    # Samples are buffered and appended to `<key>.bin` every `flush_every` records and on close().
+    # Duplicate/unsorted records are compacted in a background thread after close() (last write wins).
+    # Legacy `<key>.csv` files are imported the first time their key is read.
+    # get() returns None on a miss and the stored float (possibly 0.0) on a hit; test misses with `is None`.
+    # Once a key is warmed, its in-memory map is authoritative, even when empty, until close().
+    # `index.json` keeps summary Stats of seeds 1..n per key, tagged with the size of the key's file when they were
+    # computed. Appends of seeds > n keep an entry valid; rewriting any seed <= n invalidates it, and compaction drops
+    # such entries.
+
+    def __init__(self, label: str, root: Path = Path("data/cache"), flush_every: int = 1024):
         self.label = label
-        self.cache_dir = Path(f"data/cache/{self.label}")
-        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.cache_dir = Path(root) / self.label  # created on the first write, not here
+        self.flush_every = flush_every
+
+        self._warm: dict[Path, dict[int, float]] = {}  # file -> seed -> value, for every warmed key
+        self._pending: dict[Path, list[tuple[int, float]]] = {}  # file -> records not yet on disk
+        self._dirty: set[Path] = set()  # files appended to since the last compaction
+        self._io_lock = threading.RLock()
+        self._compaction: threading.Thread | None = None
+        self._index: dict[str, dict[str, dict]] | None = None  # key -> str(n) -> {"size": bytes, "stats": Stats.to_dict()}
+        self._index_changed = False  # entries recorded since the index was last written
+        self.hits = 0
+        self.misses = 0
+
+    def _make_filename(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams, suffix: str = ".bin") -> str:
+        return make_key(self.label, d_A, d_B, direction, extra_params) + suffix
 
-        self._warm_seed_to_value: dict[int, float] | None = None  # seed -> value
+    def _cache_file(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams) -> Path:
+        return self.cache_dir / self._make_filename(d_A, d_B, direction, extra_params)
 
-    def _make_filename(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams) -> str:
-        filename_parts = [f"{self.label}", f"dA={d_A}", f"dB={d_B}", f"direction={direction.to_str()}"]
+    def _import_csv(self, csv_file: Path, cache_file: Path) -> None:
+        import pandas as pd  # only needed for legacy files, and slow to import
 
-        for field in fields(extra_params):
-            value = getattr(extra_params, field.name)
-            if value is not None:
-                filename_parts.append(f"{field.name}={value}")
+        df = pd.read_csv(csv_file)
+        records = np.empty(len(df), dtype=RECORD_DTYPE)
+        records["seed"] = df["seed"].to_numpy().astype(np.int64)
+        records["value"] = df["value"].to_numpy().astype(np.float64)
+        tmp_file = cache_file.with_suffix(".bin.tmp")
+        records.tofile(tmp_file)
+        os.replace(tmp_file, cache_file)
 
-        return " ".join(filename_parts) + ".csv"
+    def _read_records(self, cache_file: Path) -> np.ndarray:
+        with self._io_lock:
+            if not cache_file.exists():
+                csv_file = cache_file.with_suffix(".csv")
+                if not csv_file.exists():
+                    records = np.empty(0, dtype=RECORD_DTYPE)
+                    return self._with_pending(cache_file, records)
+                self._import_csv(csv_file, cache_file)
 
-    def _load_or_create_dataframe(self, cache_file: Path) -> pd.DataFrame:
-        if cache_file.exists():
-            df = pd.read_csv(cache_file)
-            return df
+            records = np.fromfile(cache_file, dtype=RECORD_DTYPE)
+            count("cache_bytes_read", records.nbytes)
+            return self._with_pending(cache_file, records)
+
+    def _with_pending(self, cache_file: Path, records: np.ndarray) -> np.ndarray:
+        pending = self._pending.get(cache_file)
+        if not pending:
+            return records
+        return np.concatenate([records, np.array(pending, dtype=RECORD_DTYPE)])
+
+    def _append(self, cache_file: Path, seed: int, value: float) -> None:
+        pending = self._pending.setdefault(cache_file, [])
+        pending.append((int(seed), float(value)))
+        if len(pending) >= self.flush_every:
+            self._flush_file(cache_file)
+
+    def _flush_file(self, cache_file: Path) -> None:
+        with self._io_lock:
+            pending = self._pending.pop(cache_file, None)
+            if not pending:
+                return
+            if not cache_file.exists() and cache_file.with_suffix(".csv").exists():
+                self._import_csv(cache_file.with_suffix(".csv"), cache_file)
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
+            with open(cache_file, "ab") as f:
+                np.array(pending, dtype=RECORD_DTYPE).tofile(f)
+            count("cache_bytes_written", len(pending) * RECORD_DTYPE.itemsize)
+            self._dirty.add(cache_file)
+
+    @timed("cache/flush")
+    def flush(self) -> None:
+        for cache_file in list(self._pending):
+            self._flush_file(cache_file)
+
+    def _compact_file(self, cache_file: Path) -> None:
+        with self._io_lock:
+            records = np.fromfile(cache_file, dtype=RECORD_DTYPE)
+            # Reverse so that np.unique picks the most recent record for each seed.
+            seeds, last_idx = np.unique(records["seed"][::-1], return_index=True)
+            compacted = records[::-1][last_idx]
+            if len(compacted) == len(records) and np.array_equal(seeds, records["seed"]):
+                return
+            tmp_file = cache_file.with_suffix(".bin.tmp")
+            compacted.tofile(tmp_file)
+            os.replace(tmp_file, cache_file)
+
+            # Compaction keeps every seed's latest value but reorders the records, so that an entry's size no longer
+            # marks the records appended after it: each entry is checked against those records now, and moves to the
+            # compacted size if none of them rewrote a seed <= n, or is dropped otherwise.
+            entries = self._load_index().get(cache_file.stem, {})
+            for n, entry in list(entries.items()):
+                appended = records[entry["size"] // RECORD_DTYPE.itemsize :]
+                if entry["size"] <= records.nbytes and not np.any(appended["seed"] <= int(n)):
+                    entry["size"] = compacted.nbytes
+                else:
+                    del entries[n]
+            if cache_file.stem in self._load_index():
+                self._save_index()
+
+    def _compact_dirty(self, dirty: list[Path]) -> None:
+        for cache_file in dirty:
+            self._compact_file(cache_file)
+
+    def compact(self, background: bool = True) -> None:
+        self.wait()
+        with self._io_lock:
+            dirty = sorted(self._dirty)
+            self._dirty.clear()
+        if not dirty:
+            return
+        if background:
+            self._compaction = threading.Thread(target=self._compact_dirty, args=(dirty,), name=f"Cache({self.label}).compact")
+            self._compaction.start()
         else:
-            return pd.DataFrame({"seed": [], "value": []})
+            self._compact_dirty(dirty)
+
+    def wait(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def import_csv_files(self) -> int:
+        n_imported = 0
+        for csv_file in sorted(self.cache_dir.glob("*.csv")):
+            cache_file = csv_file.with_suffix(".bin")
+            with self._io_lock:
+                if cache_file.exists():
+                    continue
+                self._import_csv(csv_file, cache_file)
+            n_imported += 1
+        return n_imported
 
+    @timed("cache/warm")
     def warm(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams) -> None:
-        if self._warm_seed_to_value is not None:
-            self._warm_seed_to_value.clear()
+        # Several keys can be warm at once (e.g. both directions of a joint estimate); close() drops all of them.
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
+        records = self._read_records(cache_file)
+        # Later records win, matching the compaction rule.
+        self._warm[cache_file] = dict(zip(records["seed"].tolist(), records["value"].tolist()))
 
-        filename = self._make_filename(d_A, d_B, direction, extra_params)
-        cache_file = self.cache_dir / filename
+    def close(self) -> None:
+        self.flush()
+        if self._index_changed:
+            self._save_index()
+        self.compact(background=True)
+        self._warm.clear()
 
-        df = self._load_or_create_dataframe(cache_file)
-        seed_to_value: dict[int, float] = {}
-        if len(df) > 0:
-            for idx, seed in enumerate(df["seed"].tolist()):
-                seed_to_value[int(seed)] = df.iloc[idx]["value"]
+    @timed("cache/get")
+    def get(self, d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams) -> float | None:
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
 
-        self._warm_seed_to_value = seed_to_value
+        if (seed_to_value := self._warm.get(cache_file)) is not None:
+            value = seed_to_value.get(int(seed))
+        else:
+            records = self._read_records(cache_file)
+            matching_values = records["value"][records["seed"] == seed]
+            value = float(matching_values[-1]) if len(matching_values) else None
 
-    def close(self) -> None:
-        if self._warm_seed_to_value is not None:
-            self._warm_seed_to_value.clear()
+        if value is None:
+            self.misses += 1
+            count("cache_misses")
+        else:
+            self.hits += 1
+            count("cache_hits")
+        return value
 
-        self._warm_seed_to_value = None
+    @timed("cache/get_many")
+    def get_many(self, d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams) -> tuple[np.typing.NDArray, np.typing.NDArray]:
+        # Vectorized get(): (values, found) for an array of seeds, from one read of the key's records.
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
+        seeds = np.asarray(seeds, dtype=np.int64)
 
-    def get(self, d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams) -> float | None:
-        filename = self._make_filename(d_A, d_B, direction, extra_params)
-        cache_file = self.cache_dir / filename
+        if (seed_to_value := self._warm.get(cache_file)) is not None:
+            found_values = [seed_to_value.get(seed) for seed in seeds.tolist()]
+            found = np.array([value is not None for value in found_values], dtype=bool)
+            values = np.array([value if value is not None else np.nan for value in found_values], dtype=np.float64)
+        else:
+            records = self._read_records(cache_file)
+            # Reverse so that np.unique picks the most recent record for each seed.
+            record_seeds, last_idx = np.unique(records["seed"][::-1], return_index=True)
+            record_values = records["value"][::-1][last_idx]
+            if len(record_seeds) == 0:
+                record_seeds, record_values = np.array([-1], dtype=np.int64), np.array([np.nan])
+            idx = np.minimum(np.searchsorted(record_seeds, seeds), len(record_seeds) - 1)
+            found = record_seeds[idx] == seeds
+            values = np.where(found, record_values[idx], np.nan)
 
-        if self._warm_seed_to_value:
-            value = self._warm_seed_to_value.get(int(seed))
-            return value
+        self.hits += int(found.sum())
+        self.misses += int(len(seeds) - found.sum())
+        count("cache_hits", int(found.sum()))
+        count("cache_misses", int(len(seeds) - found.sum()))
+        return values, found
 
-        if not cache_file.exists():
-            return None
+    def _load_index(self) -> dict[str, dict[str, dict]]:
+        if self._index is None:
+            index_file = self.cache_dir / "index.json"
+            self._index = json.loads(index_file.read_text()) if index_file.exists() else {}
+        return self._index
+
+    def _save_index(self) -> None:
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        tmp_file = self.cache_dir / "index.json.tmp"
+        tmp_file.write_text(json.dumps(self._index))
+        os.replace(tmp_file, self.cache_dir / "index.json")
+        self._index_changed = False
 
-        df = self._load_or_create_dataframe(cache_file)
-        matching_rows = df[df["seed"] == seed]
-        if len(matching_rows) == 1:
-            return float(matching_rows.iloc[0]["value"])
-        elif len(matching_rows) > 1:
-            print(f"WARNING: Found {len(matching_rows)} rows for seed {seed} in {cache_file}")
-            return float(matching_rows.iloc[0]["value"])
+    def record_summary(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams, stats: Stats) -> None:
+        # Indexes `stats`, the SampleRetention.HISTOGRAM summary of seeds 1..stats.n; pending records are flushed first
+        # so the recorded size covers them. The index file is written on close().
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
+        with self._io_lock:
+            self._flush_file(cache_file)
+            size = cache_file.stat().st_size if cache_file.exists() else 0
+            self._load_index().setdefault(cache_file.stem, {})[str(stats.n)] = {"size": size, "stats": stats.to_dict()}
+            self._index_changed = True
+
+    def indexed_summary(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams, n_samples: int) -> Stats | None:
+        # Stats of seeds 1..n_samples from the index, without reading their values; None if there is no current entry.
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
+        with self._io_lock:
+            self._flush_file(cache_file)
+            entry = self._load_index().get(cache_file.stem, {}).get(str(n_samples))
+            if entry is not None and cache_file.exists():
+                size = cache_file.stat().st_size
+                if size > entry["size"]:
+                    # Only the records appended since the summary can have changed it.
+                    appended = np.fromfile(cache_file, dtype=RECORD_DTYPE, offset=entry["size"])
+                    if not np.any(appended["seed"] <= n_samples):
+                        entry["size"] = size
+                        self._save_index()
+                if size == entry["size"]:
+                    return Stats.from_dict(entry["stats"])
         return None
 
+    def summary(self, d_A: int, d_B: int, direction: Direction, extra_params: ExtraParams, n_samples: int) -> Stats | None:
+        # Indexed Stats of seeds 1..n_samples, computed from the records and indexed when stale. None if some of those
+        # seeds are not cached.
+        if (stats := self.indexed_summary(d_A, d_B, direction, extra_params, n_samples)) is not None:
+            return stats
+        values, found = self.get_many(d_A, d_B, direction, np.arange(1, n_samples + 1), extra_params)
+        if not found.all():
+            return None
+        stats = statistics(values, SampleRetention.HISTOGRAM, d_A=d_A, d_B=d_B, direction=direction)
+        self.record_summary(d_A, d_B, direction, extra_params, stats)
+        with self._io_lock:
+            self._save_index()
+        return stats
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @timed("cache/set")
     def set(self, d_A: int, d_B: int, direction: Direction, seed: int, value: float, extra_params: ExtraParams):
-        filename = self._make_filename(d_A, d_B, direction, extra_params)
-        cache_file = self.cache_dir / filename
+        cache_file = self._cache_file(d_A, d_B, direction, extra_params)
 
-        if self._warm_seed_to_value:
-            self._warm_seed_to_value[int(seed)] = value
+        if (seed_to_value := self._warm.get(cache_file)) is not None:
+            seed_to_value[int(seed)] = value
+
+        self._append(cache_file, seed, value)
+
+
+_DEFAULT_CACHE_LABELS = {"SIGNALING_CACHE": "S", "TRANSMISSION_CACHE": "T", "CORRELATION_CACHE": "C"}
+
+
+def _default_cache(name: str) -> Cache:
+    # The default caches are created on first access (relative to the working directory at that time).
+    if name not in globals():
+        globals()[name] = Cache(label=_DEFAULT_CACHE_LABELS[name])
+    return globals()[name]
 
-        df = self._load_or_create_dataframe(cache_file)
-        existing_mask = df["seed"] == seed
-        if existing_mask.any():
-            df.loc[existing_mask, "value"] = value
-        else:
-            new_row = pd.DataFrame({"seed": [seed], "value": [value]})
-            df = pd.concat([df, new_row], ignore_index=True)
 
-        df = df.sort_values("seed").reset_index(drop=True)
-        df.to_csv(cache_file, index=False)
+def __getattr__(name: str) -> Cache:
+    if name not in _DEFAULT_CACHE_LABELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _default_cache(name)
 
 
-SIGNALING_CACHE = Cache(label="S")
-TRANSMISSION_CACHE = Cache(label="T")
-CORRELATION_CACHE = Cache(label="C")
\ No newline at end of file
+def import_legacy_csv_caches() -> dict[str, int]:
+    return {cache.label: cache.import_csv_files() for cache in map(_default_cache, _DEFAULT_CACHE_LABELS)}
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from expected_signaling_probability.utils.lazy import lazy_import
+from expected_signaling_probability.utils.artifacts import ARTIFACTS
+from pathlib import Path
+from enum import Enum
+import numpy as np
+import json
+import os
+
+qt = lazy_import("qutip")
+
+# QuTiP 5 data layer of the operators of the QuTiP engine. By default an operator is kept Dense once DENSE_FROM of
+# its entries are non-zero (BCSZ superoperators have no zero entries, yet qt.rand_super_bcsz returns them as CSR),
+# and local operations are contracted on the state tensor. A per-dimension table, written by `esp bench autotune`
+# from measured timings, overrides both. Worker processes read the table from DEFAULT_TABLE.
+
+
+class DataLayer(Enum):
+    CSR = "CSR"
+    DENSE = "Dense"
+
+
+DENSE_FROM = 0.3
+DEFAULT_TABLE = Path("data") / "data_layers.json"
+
+_table: dict[str, DataLayer] | None = None  # loaded from DEFAULT_TABLE on first use
+
+
+def density(operator: qt.Qobj) -> float:
+    data = operator.data
+    nnz = data.as_scipy().nnz if isinstance(data, qt.data.CSR) else np.count_nonzero(operator.full())
+    return nnz / np.prod(operator.shape)
+
+
+def layer_for_density(density: float) -> DataLayer:
+    return DataLayer.DENSE if density >= DENSE_FROM else DataLayer.CSR
+
+
+def to_layer(operator: qt.Qobj, layer: DataLayer | None = None) -> qt.Qobj:
+    # `operator` in `layer`, or in the layer its measured density calls for.
+    layer = layer or layer_for_density(density(operator))
+    return operator.to(layer.value)
+
+
+def table_key(role: str, d_A: int, d_B: int) -> str:
+    # e.g. "global dA=3 dB=2"; roles are "global", "local_A" and "local_B".
+    return f"{role} dA={d_A} dB={d_B}"
+
+
+def load_table(path: Path = DEFAULT_TABLE) -> dict[str, DataLayer]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return {key: DataLayer(layer) for key, layer in json.loads(path.read_text()).items()}
+
+
+def write_table(table: dict[str, DataLayer], path: Path = DEFAULT_TABLE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    tmp_file.write_text(json.dumps({key: layer.value for key, layer in sorted(table.items())}, indent=2))
+    os.replace(tmp_file, path)
+
+
+def use_table(table: dict[str, DataLayer] | None) -> None:
+    # Replaces the table of this process; None reloads DEFAULT_TABLE on the next lookup.
+    global _table
+    _table = table
+    ARTIFACTS.clear()  # drawn in the layers of the previous table
+
+
+def tuned_layer(role: str, d_A: int, d_B: int) -> DataLayer | None:
+    global _table
+    if _table is None:
+        _table = load_table()
+    return _table.get(table_key(role, d_A, d_B))
+
+
+def global_layer(d_A: int, d_B: int) -> DataLayer:
+    return tuned_layer("global", d_A, d_B) or layer_for_density(1.0)  # BCSZ draws are completely filled
+
+
+def local_layer(d_A: int, d_B: int, subsystem: int) -> DataLayer:
+    # DENSE contracts the d² x d² local superoperator on the state; CSR applies its sparse super_tensor with the identity.
+    return tuned_layer("local_A" if subsystem == 0 else "local_B", d_A, d_B) or DataLayer.DENSE
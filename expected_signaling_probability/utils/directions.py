@@ -8,5 +8,16 @@ class Direction(Enum):
     def to_ptrace_index(self) -> int:
         return 1 if self == Direction.A_TO_B else 0
 
+    def to_local_index(self) -> int:
+        return 0 if self == Direction.A_TO_B else 1
+
     def to_str(self) -> str:
         return "AtoB" if self == Direction.A_TO_B else "BtoA"
+
+    @classmethod
+    def from_str(cls, value: str) -> "Direction":
+        # Accepts both the to_str() form ("AtoB") and the enum value ("A to B").
+        for direction in cls:
+            if value in (direction.to_str(), direction.value):
+                return direction
+        raise ValueError(f"Unknown direction {value!r}")
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class Engine(Enum):
+    QUTIP = "qutip"  # dense QuTiP superoperators
+    KRAUS = "kraus"  # NumPy Kraus operators of rank ExtraParams.superoperator_rank
@@ -1,7 +1,9 @@
+from expected_signaling_probability.utils.lazy import lazy_import
 from dataclasses import dataclass
-from scipy import stats as sp_stats
 import numpy as np
 
+sp_stats = lazy_import("scipy.stats")  # only for the p-value
+
 
 @dataclass
 class PowerLawFit:
@@ -13,27 +15,79 @@ class PowerLawFit:
     stderr: float
     pval: float
     prefactor: float
+    correction: float | None = None  # c of the finite-size term, when fitted
+
+
+@dataclass
+class PowerLawFits:
+    # Parameters of many fits at once, with the batch shape of the fitted curves.
+    slope: np.typing.NDArray
+    intercept: np.typing.NDArray  # log10 of the prefactor
+    stderr: np.typing.NDArray
+    r2: np.typing.NDArray
+    correction: np.typing.NDArray | None = None
 
 
-def fit_power_law(x: np.typing.NDArray, y: np.typing.NDArray) -> PowerLawFit:
-    log_x = np.log10(x)
+def _design_matrix(x: np.typing.NDArray, finite_size: bool) -> np.typing.NDArray:
+    # Columns of log10 y = intercept + slope · log10 x [+ correction · log10(e) / x]. The last one is the model
+    # y = prefactor · x^slope · exp(c / x), i.e. x^slope · (1 + c/x) to first order in 1/x.
+    columns = [np.ones_like(x), np.log10(x)]
+    if finite_size:
+        columns.append(np.log10(np.e) / x)
+    return np.stack(columns, axis=-1)
+
+
+def fit_power_laws(x: np.typing.NDArray, y: np.typing.NDArray, sem: np.typing.NDArray | None = None, finite_size: bool = False) -> PowerLawFits:
+    # Fits every curve y[..., :] against x (shape (n,)) with one stacked weighted least-squares solve in log-log space.
+    # `sem` (broadcastable to y) is the standard error of each y and weights the points by 1 / sem_log², where
+    # sem_log = sem / (y ln 10); without it the points are weighted equally, which is the ordinary fit. Standard errors
+    # are scaled by the reduced χ², as for an unweighted regression.
+    x = np.asarray(x, dtype=float)
     log_y = np.log10(np.maximum(y, np.finfo(float).tiny))
-    slope, intercept = np.polyfit(log_x, log_y, 1)
-    x_fit = np.logspace(np.log10(x.min()), np.log10(x.max()), 200)
-    y_fit = 10 ** (intercept + slope * np.log10(x_fit))
+    X = _design_matrix(x, finite_size)
+    n, p = X.shape
+    if sem is None:
+        weights = np.ones_like(log_y)
+    else:
+        weights = (np.asarray(y) * np.log(10) / np.asarray(sem)) ** 2 * np.ones_like(log_y)
 
-    lin = sp_stats.linregress(log_x, log_y)
-    r2 = float(lin.rvalue**2)  # type: ignore
-    stderr = float(lin.stderr)  # type: ignore
-    pval = float(lin.pvalue)  # type: ignore
-    prefactor = float(10**intercept)
+    XtW = X.T * weights[..., None, :]
+    normal_matrix = XtW @ X
+    params = np.linalg.solve(normal_matrix, (XtW @ log_y[..., None]))[..., 0]
+
+    residuals = log_y - params @ X.T
+    chi2 = np.sum(weights * residuals**2, axis=-1)
+    covariance = np.linalg.inv(normal_matrix) * (chi2 / max(n - p, 1))[..., None, None]  # exact fits (n = p) have zero stderr
+    weighted_mean = np.sum(weights * log_y, axis=-1) / np.sum(weights, axis=-1)
+    total = np.sum(weights * (log_y - weighted_mean[..., None]) ** 2, axis=-1)
+    return PowerLawFits(
+        slope=params[..., 1],
+        intercept=params[..., 0],
+        stderr=np.sqrt(covariance[..., 1, 1]),
+        r2=1 - chi2 / total,
+        correction=params[..., 2] if finite_size else None,
+    )
+
+
+def fit_power_law(x: np.typing.NDArray, y: np.typing.NDArray, sem: np.typing.NDArray | None = None, finite_size: bool = False) -> PowerLawFit:
+    fits = fit_power_laws(x, y, sem, finite_size)
+    slope, intercept, stderr = float(fits.slope), float(fits.intercept), float(fits.stderr)
+    correction = float(fits.correction) if fits.correction is not None else None
+
+    x_fit = np.logspace(np.log10(x.min()), np.log10(x.max()), 200)
+    log_y_fit = intercept + slope * np.log10(x_fit)
+    if correction is not None:
+        log_y_fit += correction * np.log10(np.e) / x_fit
+    dof = len(x) - (3 if finite_size else 2)
+    pval = float(2 * sp_stats.t.sf(abs(slope / stderr), dof)) if stderr > 0 else 0.0
     return PowerLawFit(
         x_fit=x_fit,
-        y_fit=y_fit,
+        y_fit=10**log_y_fit,
         slope=slope,
         intercept=intercept,
-        r2=r2,
+        r2=float(fits.r2),
         stderr=stderr,
         pval=pval,
-        prefactor=prefactor,
+        prefactor=float(10**intercept),
+        correction=correction,
     )
@@ -0,0 +1,121 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+import cProfile
+import time
+import json
+import os
+
+# Opt-in timers and counters for the estimator hot paths. Everything is a no-op (one global lookup) unless a
+# `recording()` is active in this process; samples computed in pool workers are not recorded, so profile with
+# n_workers=1 for a per-phase breakdown.
+
+
+@dataclass
+class Instrumentation:
+    phases: dict[str, list[float]] = field(default_factory=dict)  # name -> [seconds, calls]; nested phases overlap
+    counters: dict[str, int] = field(default_factory=dict)
+    throughput: dict[str, list[float]] = field(default_factory=dict)  # e.g. "expected_signaling_probability dA=2 dB=3" -> [samples, seconds]
+    wall_time: float = 0.0
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def merge(self, other: "Instrumentation") -> None:
+        for name, (seconds, calls) in other.phases.items():
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        for name, n in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + n
+        for name, (samples, seconds) in other.throughput.items():
+            entry = self.throughput.setdefault(name, [0, 0.0])
+            entry[0] += samples
+            entry[1] += seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_time": self.wall_time,
+            "phases": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in sorted(self.phases.items(), key=lambda item: -item[1][0])},
+            "counters": dict(sorted(self.counters.items())),
+            "throughput": {
+                name: {"samples": samples, "seconds": seconds, "samples_per_second": samples / seconds if seconds > 0 else None}
+                for name, (samples, seconds) in self.throughput.items()
+            },
+        }
+
+
+_active: Instrumentation | None = None
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    # Decorator adding each call's duration to the phase `name`.
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if _active is not None:
+                    _active.add_phase(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    if _active is not None:
+        _active.counters[name] = _active.counters.get(name, 0) + n
+
+
+def record_samples(name: str, samples: int, seconds: float) -> None:
+    if _active is not None:
+        entry = _active.throughput.setdefault(name, [0, 0.0])
+        entry[0] += samples
+        entry[1] += seconds
+
+
+def write_report(path: Path, instrumentation: Instrumentation) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    tmp_file.write_text(json.dumps(instrumentation.to_dict(), indent=2))
+    os.replace(tmp_file, path)
+
+
+@contextmanager
+def recording(report: Path | None = None, profile: Path | None = None) -> Iterator[Instrumentation]:
+    # Records everything run inside the block; at the end, writes the JSON `report` and the cProfile `profile`
+    # (readable with pstats) when given. A nested recording is also merged into the enclosing one.
+    global _active
+    outer = _active
+    instrumentation = _active = Instrumentation()
+    profiler = cProfile.Profile() if profile is not None else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield instrumentation
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            Path(profile).parent.mkdir(parents=True, exist_ok=True)  # type: ignore[arg-type]
+            profiler.dump_stats(profile)
+        instrumentation.wall_time = time.perf_counter() - start
+        _active = outer
+        if outer is not None:
+            outer.merge(instrumentation)
+        if report is not None:
+            write_report(report, instrumentation)
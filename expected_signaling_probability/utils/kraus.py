@@ -0,0 +1,224 @@
+from expected_signaling_probability.utils.instrumentation import timed
+from collections.abc import Iterable
+from dataclasses import dataclass
+import numpy as np
+
+
+# Mirrors qutip.random_objects._randnz(..., norm="ginibre") so that, for the same generator,
+# the arrays below reproduce the draws made by qt.rand_dm / qt.rand_super_bcsz exactly.
+_UNITS = np.array([1, 1j])
+
+# All kernels below accept arrays with leading batch axes (`...`), one entry per seed.
+
+
+def ginibre(shape: tuple[int, ...], generator: np.random.Generator) -> np.typing.NDArray:
+    return np.sum(generator.normal(size=shape + (2,)) * _UNITS, axis=-1)
+
+
+def stacked_ginibre(shape: tuple[int, ...], seeds: Iterable[int | np.random.Generator]) -> np.typing.NDArray:
+    # One independent generator per seed, exactly as the per-sample QuTiP calls construct them. Generators are used as given.
+    return np.stack([ginibre(shape, np.random.default_rng(seed)) for seed in seeds])
+
+
+def dm_from_ginibre(X: np.typing.NDArray) -> np.typing.NDArray:
+    rho = X @ np.swapaxes(X, -1, -2).conj()
+    rho /= np.trace(rho, axis1=-2, axis2=-1)[..., None, None]
+    return rho
+
+
+def kraus_from_ginibre(X: np.typing.NDArray, N: int) -> np.typing.NDArray:
+    # X has shape (..., N², rank), the Ginibre matrix of qt.rand_super_bcsz. Its Choi matrix is Z X X^† Z
+    # with Z = 1 ⊗ Y^{-1/2}, so the columns of Z X, reshaped to N x N, are a Kraus decomposition of that channel.
+    X = X.reshape(X.shape[:-2] + (N, N, X.shape[-1]))
+    Y = np.einsum("...ijr,...ikr->...jk", X, X.conj())
+    eigvals, eigvecs = np.linalg.eigh(Y)
+    Y_inv_sqrt = (eigvecs / np.sqrt(eigvals)[..., None, :]) @ np.swapaxes(eigvecs, -1, -2).conj()
+    return np.einsum("...jk,...ikr->...rij", Y_inv_sqrt, X)
+
+
+def _bcsz_rank(N: int, rank: int | None) -> int:
+    if rank is None:
+        rank = N**2
+    if rank > N**2:
+        raise ValueError("Rank cannot exceed superoperator dimension.")
+    return rank
+
+
+def rand_dm_ginibre(N: int, generator: np.random.Generator) -> np.typing.NDArray:
+    return dm_from_ginibre(ginibre((N, N), generator))
+
+
+def rand_kraus_bcsz(N: int, rank: int | None, generator: np.random.Generator) -> np.typing.NDArray:
+    return kraus_from_ginibre(ginibre((N**2, _bcsz_rank(N, rank)), generator), N)
+
+
+def rand_kraus_bcsz_leading(N: int, rank: int | None, generator: np.random.Generator) -> np.typing.NDArray:
+    # Same distribution as rand_kraus_bcsz, from the leading `rank` columns of a full-rank draw, so one generator
+    # gives nested channels across ranks (and the full-rank channel of rand_kraus_bcsz for rank = N²).
+    return kraus_from_ginibre(ginibre((N**2, N**2), generator)[..., : _bcsz_rank(N, rank)], N)
+
+
+def rand_dm_induced(d: int, K: int, generator: np.random.Generator) -> np.typing.NDArray:
+    # G G^†/Tr for a d x K Ginibre matrix G (K >= d), i.e. a state of the induced measure with environment dimension K,
+    # via the complex Bartlett decomposition G G^† = T T^†: T is lower triangular with |T_ii|² ~ χ²_{2(K-i)} and
+    # Ginibre entries below the diagonal, so only d² numbers are drawn whatever K. Same distribution as
+    # dm_from_ginibre(ginibre((d, K), ...)), but not the same draws.
+    T = np.zeros((d, d), dtype=complex)
+    T[np.diag_indices(d)] = np.sqrt(generator.chisquare(2 * (K - np.arange(d))))
+    rows, cols = np.tril_indices(d, -1)
+    T[rows, cols] = ginibre((len(rows),), generator)
+    return dm_from_ginibre(T)
+
+
+def rand_dm_ginibre_batch(N: int, seeds: Iterable[int | np.random.Generator]) -> np.typing.NDArray:
+    return dm_from_ginibre(stacked_ginibre((N, N), seeds))
+
+
+def rand_dm_induced_batch(d: int, K: int, seeds: Iterable[int | np.random.Generator]) -> np.typing.NDArray:
+    return np.stack([rand_dm_induced(d, K, np.random.default_rng(seed)) for seed in seeds])
+
+
+def rand_kraus_bcsz_batch(N: int, rank: int | None, seeds: Iterable[int | np.random.Generator]) -> np.typing.NDArray:
+    return kraus_from_ginibre(stacked_ginibre((N**2, _bcsz_rank(N, rank)), seeds), N)
+
+
+def rand_kraus_bcsz_leading_batch(N: int, rank: int | None, seeds: Iterable[int | np.random.Generator]) -> np.typing.NDArray:
+    return kraus_from_ginibre(stacked_ginibre((N**2, N**2), seeds)[..., : _bcsz_rank(N, rank)], N)
+
+
+@timed("channel_application_ptrace")
+def reduced_outputs_over_ranks(X: np.typing.NDArray, rho: np.typing.NDArray, d_A: int, d_B: int, keep: int, ranks: list[int]) -> np.typing.NDArray:
+    # Tr_X ℰ_r(ρ) for each r in the increasing `ranks`, ℰ_r the channel of the leading r columns of the full-rank draw X
+    # (shape (..., N², N²)); returns (..., len(ranks), d_keep, d_keep). With X_k the k-th column as an N x N matrix,
+    # ℰ_r(ρ) = Σ_{k≤r} X_k W_r^{-1/2} ρ W_r^{-1/2} X_k^† with W_r = Σ_{k≤r} X_k^† X_k, so running sums of W_r and of the
+    # partial-traced maps ρ ↦ Tr_X(X_k ρ X_k^†) give every rank for about the cost of the full-rank channel.
+    N = d_A * d_B
+    X = X.reshape(X.shape[:-2] + (N, N, N**2))
+    W = np.zeros(X.shape[:-3] + (N, N), dtype=complex)
+    d_keep = d_A if keep == 0 else d_B
+    T = np.zeros(X.shape[:-3] + (d_keep, d_keep, N, N), dtype=complex)
+    outputs = []
+    for k in range(ranks[-1]):
+        X_k = X[..., k]
+        W += np.swapaxes(X_k, -1, -2).conj() @ X_k
+        X_k = X_k.reshape(X_k.shape[:-2] + (d_A, d_B, N))
+        if keep == 0:
+            T += np.einsum("...abj,...cbl->...acjl", X_k, X_k.conj())
+        else:
+            T += np.einsum("...abj,...acl->...bcjl", X_k, X_k.conj())
+        if k + 1 in ranks:
+            eigvals, eigvecs = np.linalg.eigh(W)
+            W_inv_sqrt = (eigvecs / np.sqrt(eigvals)[..., None, :]) @ np.swapaxes(eigvecs, -1, -2).conj()
+            outputs.append(np.einsum("...acjl,...jl->...ac", T, W_inv_sqrt @ rho @ W_inv_sqrt))
+    return np.stack(outputs, axis=-3)
+
+
+@dataclass
+class KrausChannel:
+    operators: np.typing.NDArray  # shape (..., rank, d_out, d_in)
+
+    @property
+    def rank(self) -> int:
+        return self.operators.shape[-3]
+
+    @timed("channel_application")
+    def __call__(self, rho: np.typing.NDArray) -> np.typing.NDArray:
+        K = self.operators
+        return np.einsum("...rij,...rkj->...ik", K @ rho[..., None, :, :], K.conj())
+
+    def _split_outputs(self, rho: np.typing.NDArray, d_A: int, d_B: int) -> tuple[np.typing.NDArray, np.typing.NDArray]:
+        # K ρ and K* with their output index split into (d_A, d_B).
+        K = self.operators
+        shape = K.shape[:-2] + (d_A, d_B, K.shape[-1])
+        return (K @ rho[..., None, :, :]).reshape(shape), K.conj().reshape(shape)
+
+    @timed("channel_application_ptrace")
+    def reduced(self, rho: np.typing.NDArray, d_A: int, d_B: int, keep: int) -> np.typing.NDArray:
+        # ptrace(self(rho), d_A, d_B, keep), contracting the traced index directly instead of forming the d_A·d_B dimensional output.
+        K_rho, K_conj = self._split_outputs(rho, d_A, d_B)
+        if keep == 0:
+            return np.einsum("...rabk,...rcbk->...ac", K_rho, K_conj)
+        return np.einsum("...rabk,...rack->...bc", K_rho, K_conj)
+
+    @timed("channel_application_ptrace")
+    def marginals(self, rho: np.typing.NDArray, d_A: int, d_B: int) -> tuple[np.typing.NDArray, np.typing.NDArray]:
+        # Both reduced outputs (keep=0, keep=1) from one K ρ product.
+        K_rho, K_conj = self._split_outputs(rho, d_A, d_B)
+        return np.einsum("...rabk,...rcbk->...ac", K_rho, K_conj), np.einsum("...rabk,...rack->...bc", K_rho, K_conj)
+
+
+@dataclass
+class LocalKrausChannel:
+    operators: np.typing.NDArray  # shape (..., rank, d, d) with d the dimension of `subsystem`
+    d_A: int
+    d_B: int
+    subsystem: int  # 0 acts on A, 1 acts on B
+
+    @property
+    def rank(self) -> int:
+        return self.operators.shape[-3]
+
+    @timed("local_op")
+    def __call__(self, rho: np.typing.NDArray) -> np.typing.NDArray:
+        # (K ⊗ 1) ρ (K ⊗ 1)^† contracted on the (d_A, d_B, d_A, d_B) tensor, never forming K ⊗ 1.
+        K = self.operators
+        batch_shape = rho.shape[:-2]
+        rho = rho.reshape(batch_shape + (self.d_A, self.d_B, self.d_A, self.d_B))
+        if self.subsystem == 0:
+            out = np.einsum("...rxbcd,...ryc->...xbyd", np.einsum("...rxa,...abcd->...rxbcd", K, rho), K.conj())
+        else:
+            out = np.einsum("...raxcd,...ryd->...axcy", np.einsum("...rxb,...abcd->...raxcd", K, rho), K.conj())
+        d = self.d_A * self.d_B
+        return out.reshape(batch_shape + (d, d))
+
+
+@timed("ptrace")
+def ptrace(rho: np.typing.NDArray, d_A: int, d_B: int, keep: int) -> np.typing.NDArray:
+    # `keep` follows the qt.ptrace convention: 0 keeps subsystem A, 1 keeps subsystem B.
+    rho = rho.reshape(rho.shape[:-2] + (d_A, d_B, d_A, d_B))
+    if keep == 0:
+        return np.einsum("...ijkj->...ik", rho)
+    return np.einsum("...ijik->...jk", rho)
+
+
+def _trace_norm_2x2(delta: np.typing.NDArray) -> np.typing.NDArray:
+    # Eigenvalues m ± r, and |m + r| + |m - r| = 2 max(|m|, r). For a difference of states m = 0 and r is the Bloch-vector distance / 2.
+    a, d = delta[..., 0, 0].real, delta[..., 1, 1].real
+    m = (a + d) / 2
+    r = np.sqrt(((a - d) / 2) ** 2 + np.abs(delta[..., 0, 1]) ** 2)
+    return 2 * np.maximum(np.abs(m), r)
+
+
+def _trace_norm_3x3(delta: np.typing.NDArray) -> np.typing.NDArray:
+    # Trigonometric solution of the characteristic cubic of a Hermitian 3 x 3 matrix (Smith, 1961).
+    q = np.trace(delta, axis1=-2, axis2=-1).real / 3
+    shifted = delta - q[..., None, None] * np.eye(3)
+    p = np.sqrt(np.sum(np.abs(shifted) ** 2, axis=(-2, -1)) / 6)
+    safe_p = np.where(p > 0, p, 1)
+    half_det = np.linalg.det(shifted / safe_p[..., None, None]).real / 2
+    phi = np.arccos(np.clip(half_det, -1, 1)) / 3
+    l1 = q + 2 * p * np.cos(phi)
+    l3 = q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    l2 = 3 * q - l1 - l3
+    return np.abs(l1) + np.abs(l2) + np.abs(l3)
+
+
+@timed("tracedist")
+def trace_norm(delta: np.typing.NDArray) -> np.typing.NDArray:
+    # Trace norm of a Hermitian matrix (or batch): closed forms for qubits and batches of qutrits, eigvalsh otherwise.
+    # (For one qutrit, the dozen small NumPy calls of the closed form cost more than a single eigvalsh.)
+    d = delta.shape[-1]
+    if d == 1:
+        norm = np.abs(delta[..., 0, 0])
+    elif d == 2:
+        norm = _trace_norm_2x2(delta)
+    elif d == 3 and delta.ndim > 2:
+        norm = _trace_norm_3x3(delta)
+    else:
+        norm = np.sum(np.abs(np.linalg.eigvalsh(delta)), axis=-1)
+    return norm
+
+
+def tracedist(rho: np.typing.NDArray, sigma: np.typing.NDArray) -> np.typing.NDArray:
+    # A scalar for a single pair of states, one distance per batch entry otherwise.
+    return 0.5 * trace_norm(rho - sigma)
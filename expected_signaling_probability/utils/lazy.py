@@ -0,0 +1,18 @@
+from types import ModuleType
+import importlib.util
+import sys
+
+
+def lazy_import(name: str) -> ModuleType:
+    # The module body runs on first attribute access, so e.g. Kraus-engine workers never pay for importing qutip.
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,53 @@
+from expected_signaling_probability.utils.stats import Stats
+from pathlib import Path
+import json
+import os
+
+
+class Manifest:
+    # Append-only JSON Lines log of the finished cells of a sweep, and the last line per cell wins:
+    #   {"cell": key, "n_samples": N, "rtol": r, "stats": {...}}   the cell is finished, with its summary Stats
+    # A cell that the time budget stopped before N seeds also records "time_budget" and "n_used", and is only restored
+    # by runs with the same budget: any other run carries on from its seeds in the cache.
+    # Unfinished cells resume from the per-seed cache, which holds every seed drawn before an interruption.
+    # A torn last line from a killed run is ignored on load.
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: dict[str, dict] = {}
+        if self.path.exists():
+            for line in self.path.read_text().splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._entries[entry["cell"]] = entry
+
+    def _append(self, entry: dict) -> None:
+        self._entries[entry["cell"]] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def finished(self, key: str, n_samples: int, rtol: float | None, time_budget: float | None = None) -> Stats | None:
+        entry = self._entries.get(key)
+        if entry is None or "stats" not in entry or entry["n_samples"] != n_samples or entry.get("rtol") != rtol:
+            return None
+        if "time_budget" in entry and (entry["time_budget"] != time_budget or entry["n_used"] != entry["stats"]["n"]):
+            return None
+        return Stats.from_dict(entry["stats"])
+
+    def record_finished(self, key: str, n_samples: int, rtol: float | None, stats: Stats, time_budget: float | None = None) -> None:
+        # `time_budget` only when the budget stopped the cell before n_samples seeds.
+        entry = {"cell": key, "n_samples": n_samples, "rtol": rtol, "stats": stats.to_dict()}
+        if time_budget is not None:
+            entry |= {"time_budget": time_budget, "n_used": stats.n}
+        self._append(entry)
+
+    def compact(self) -> None:
+        # Rewrites the log with only the latest line per cell.
+        tmp_file = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_file.write_text("".join(json.dumps(entry) + "\n" for entry in self._entries.values()))
+        os.replace(tmp_file, self.path)
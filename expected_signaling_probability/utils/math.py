@@ -1,44 +1,125 @@
-from expected_signaling_probability.utils.params import ExtraParams, DEFAULT_EXTRA_PARAMS
+from __future__ import annotations
+from expected_signaling_probability.utils.lazy import lazy_import
+from expected_signaling_probability.utils.params import ExtraParams, DEFAULT_EXTRA_PARAMS, ComputeParams, DEFAULT_COMPUTE_PARAMS
+from expected_signaling_probability.utils.kraus import (
+    KrausChannel,
+    LocalKrausChannel,
+    rand_dm_ginibre,
+    rand_dm_ginibre_batch,
+    rand_dm_induced,
+    rand_dm_induced_batch,
+    rand_kraus_bcsz,
+    rand_kraus_bcsz_batch,
+    rand_kraus_bcsz_leading,
+    rand_kraus_bcsz_leading_batch,
+    reduced_outputs_over_ranks,
+    stacked_ginibre,
+    ginibre,
+    ptrace,
+    trace_norm,
+)
+from expected_signaling_probability.utils.superoperators import LocalSuperoperator
+from expected_signaling_probability.utils.data_layers import global_layer, local_layer, to_layer
+from expected_signaling_probability.utils.quantities import Quantity
 from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.seeding import Component, component_seed, component_seeds
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.stats import AdaptiveStopping, ADAPTIVE_CHECK_EVERY
+from expected_signaling_probability.utils import instrumentation
+from expected_signaling_probability.utils.instrumentation import timed
+from expected_signaling_probability.utils.artifacts import cached_artifact
 from expected_signaling_probability.utils.caching import (
     Cache, 
     SIGNALING_CACHE, 
     TRANSMISSION_CACHE,
     CORRELATION_CACHE,
 )
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, replace
+from functools import partial, wraps
 from tqdm import tqdm
-import qutip as qt
 import numpy as np
+import multiprocessing
+import inspect
+import time
+
+qt = lazy_import("qutip")  # only the QuTiP engine touches it, so Kraus-engine workers never import it
+
+
+# Column order of the estimators that evaluate both directions from one draw.
+BOTH_DIRECTIONS = (Direction.A_TO_B, Direction.B_TO_A)
+
+
+@timed("channel_application")
+def _apply_superoperator(superoperator: qt.Qobj, state: qt.Qobj) -> qt.Qobj:
+    return superoperator(state)
+
+
+@timed("ptrace")
+def _qt_ptrace(state: qt.Qobj, keep: int) -> qt.Qobj:
+    return qt.ptrace(state, keep)
+
+
+def _recorded(estimator: Callable[..., np.typing.NDArray | dict]) -> Callable[..., np.typing.NDArray | dict]:
+    # Records samples per second per dimension into the active instrumentation, and writes the report and profile
+    # requested by compute_params at the end of the run. Just the estimator call when neither applies.
+    signature = inspect.signature(estimator)
+
+    @wraps(estimator)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        compute_params = arguments.get("compute_params", DEFAULT_COMPUTE_PARAMS)
+        if compute_params.report is None and compute_params.profile is None and not instrumentation.enabled():
+            return estimator(*args, **kwargs)
+
+        with instrumentation.recording(compute_params.report, compute_params.profile):
+            start = time.perf_counter()
+            result = estimator(*args, **kwargs)
+            instrumentation.record_samples(f"{estimator.__name__} dA={arguments['d_A']} dB={arguments['d_B']}", arguments["n_samples"], time.perf_counter() - start)
+        return result
+
+    return wrapper
 
 
 def _compute_signaling_probability(
     initial_state: qt.Qobj,
-    local_operation: qt.Qobj,
+    local_operation: qt.Qobj | LocalSuperoperator,
     global_superoperator: qt.Qobj,
     direction: Direction = Direction.A_TO_B,
 ) -> float:
-    altered_initial_state = local_operation(initial_state)
-
-    final_state = global_superoperator(initial_state)
-    final_altered_state = global_superoperator(altered_initial_state)
-
-    reduced_final_state = qt.ptrace(final_state, direction.to_ptrace_index())
-    reduced_final_altered_state = qt.ptrace(final_altered_state, direction.to_ptrace_index())
-
-    tr_dist = qt.tracedist(reduced_final_state, reduced_final_altered_state)
+    # ℰ is linear, so ℰ(ρ) - ℰ(𝒜(ρ)) = ℰ(ρ - 𝒜(ρ)): one application of the global superoperator instead of two.
+    difference = initial_state - local_operation(initial_state)
+    reduced_final_difference = _qt_ptrace(_apply_superoperator(global_superoperator, difference), direction.to_ptrace_index())
+    tr_dist = 0.5 * trace_norm(reduced_final_difference.full())
     return tr_dist
 
 
-def generate_random_dm(d_A: int, d_B: int, seed: int | None = None) -> qt.Qobj:
-    random_dm = qt.rand_dm(dimensions=[d_A, d_B], seed=seed)  # type: ignore
+# Every generator below draws one component of the sample `seed`; ExtraParams.seeding decides
+# how that component's random stream is derived from the seed (see utils/seeding.py).
+
+@cached_artifact
+@timed("state_draw")
+def generate_random_dm(d_A: int, d_B: int, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS, component: Component = Component.STATE) -> qt.Qobj:
+    random_dm = qt.rand_dm(dimensions=[d_A, d_B], seed=component_seed(seed, component, extra_params.seeding))  # type: ignore
     return random_dm
 
 
+@cached_artifact
+@timed("channel_draw")
 def generate_random_superoperator(d_A: int, d_B: int, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> qt.Qobj:
-    return qt.rand_super_bcsz([d_A, d_B], seed=seed, rank=extra_params.superoperator_rank)  # type: ignore
+    # Drawn directly in its data layer (see utils/data_layers.py), which changes the samples only by rounding.
+    seed = component_seed(seed, Component.GLOBAL_CHANNEL, extra_params.seeding)
+    layer = global_layer(d_A, d_B)
+    if extra_params.global_channel_rank is not None:
+        operators = rand_kraus_bcsz_leading(d_A * d_B, extra_params.global_channel_rank, np.random.default_rng(seed))
+        return to_layer(qt.kraus_to_super([qt.Qobj(K, dims=[[d_A, d_B], [d_A, d_B]]) for K in operators]), layer)
+    return qt.rand_super_bcsz([d_A, d_B], seed=seed, rank=extra_params.superoperator_rank, dtype=layer.value)  # type: ignore
 
 
+@timed("local_op_draw")
 def generate_random_local_superoperator(d_A: int, d_B: int, direction: Direction, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> qt.Qobj:
+    seed = component_seed(seed, Component.local_channel(direction.to_local_index()), extra_params.seeding)
     if direction == Direction.A_TO_B:
         local_superoperator = qt.super_tensor(
             qt.rand_super_bcsz(d_A, seed=seed, rank=extra_params.superoperator_rank),  # type: ignore
@@ -52,21 +133,325 @@ def generate_random_local_superoperator(d_A: int, d_B: int, direction: Direction
     return local_superoperator
 
 
-def _one_shot_signaling_probability(d_A: int, d_B: int, direction: Direction, seed: int, cache: Cache | None = SIGNALING_CACHE, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> float:
-    if cache and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)):
-        return cached_result
+@cached_artifact
+@timed("local_op_draw")
+def generate_random_local_channel(d_A: int, d_B: int, direction: Direction, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> LocalSuperoperator:
+    # Same channel as generate_random_local_superoperator, without tensoring in the identity superoperator.
+    subsystem = direction.to_local_index()
+    d = d_A if subsystem == 0 else d_B
+    seed = component_seed(seed, Component.local_channel(subsystem), extra_params.seeding)
+    superoperator = qt.rand_super_bcsz(d, seed=seed, rank=extra_params.superoperator_rank)  # type: ignore
+    return LocalSuperoperator(superoperator, d_A, d_B, subsystem, local_layer(d_A, d_B, subsystem))
+
+
+# ------------------------------------------------------------
+#                        kraus engine
+# ------------------------------------------------------------
+# Draws the same states and channels as the QuTiP generators above for a given seed, but keeps
+# channels as `rank` Kraus operators so memory scales with d² · rank instead of d⁴.
+# The same functions evaluate whole batches of seeds when given stacked arrays.
+
+def _compute_signaling_probability_kraus(
+    initial_state: np.typing.NDArray,
+    local_operation: LocalKrausChannel,
+    global_channel: KrausChannel,
+    d_A: int,
+    d_B: int,
+    direction: Direction = Direction.A_TO_B,
+) -> float | np.typing.NDArray:
+    # Tr_X ∘ ℰ applied once to ρ - 𝒜(ρ); only the d_X x d_X reduced output is formed.
+    difference = initial_state - local_operation(initial_state)
+    reduced_final_difference = global_channel.reduced(difference, d_A, d_B, direction.to_ptrace_index())
+    tr_dist = 0.5 * trace_norm(reduced_final_difference)
+    return tr_dist
+
+
+@cached_artifact
+@timed("state_draw")
+def generate_random_dm_array(d_A: int, d_B: int, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS, component: Component = Component.STATE) -> np.typing.NDArray:
+    return rand_dm_ginibre(d_A * d_B, np.random.default_rng(component_seed(seed, component, extra_params.seeding)))
+
+
+@cached_artifact
+@timed("channel_draw")
+def generate_random_kraus_channel(d_A: int, d_B: int, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> KrausChannel:
+    generator = np.random.default_rng(component_seed(seed, Component.GLOBAL_CHANNEL, extra_params.seeding))
+    if extra_params.global_channel_rank is not None:
+        return KrausChannel(rand_kraus_bcsz_leading(d_A * d_B, extra_params.global_channel_rank, generator))
+    return KrausChannel(rand_kraus_bcsz(d_A * d_B, extra_params.superoperator_rank, generator))
+
+
+@cached_artifact
+@timed("local_op_draw")
+def generate_random_local_kraus_channel(d_A: int, d_B: int, direction: Direction, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> LocalKrausChannel:
+    subsystem = direction.to_local_index()
+    d = d_A if subsystem == 0 else d_B
+    generator = np.random.default_rng(component_seed(seed, Component.local_channel(subsystem), extra_params.seeding))
+    operators = rand_kraus_bcsz(d, extra_params.superoperator_rank, generator)
+    return LocalKrausChannel(operators, d_A, d_B, subsystem)
+
+
+@cached_artifact
+@timed("state_draw")
+def generate_random_dm_batch(d_A: int, d_B: int, seeds: np.typing.NDArray, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS, component: Component = Component.STATE) -> np.typing.NDArray:
+    return rand_dm_ginibre_batch(d_A * d_B, component_seeds(seeds, component, extra_params.seeding))
+
 
-    initial_state = generate_random_dm(d_A, d_B, seed)
-    local_operation = generate_random_local_superoperator(d_A, d_B, direction, seed, extra_params)
+@timed("state_draw")
+def generate_random_marginal(d_A: int, d_B: int, keep: int, seed: int | None = None, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS, component: Component = Component.STATE) -> np.typing.NDArray:
+    # The `keep` marginal of a random d_A·d_B state (Ginibre-type, as qt.rand_dm) drawn without the state: Tr_X G G^†
+    # is W W^† for the d_keep x (d_X·d_A·d_B) Ginibre matrix W made of the blocks of G.
+    d_keep, d_traced = (d_A, d_B) if keep == 0 else (d_B, d_A)
+    return rand_dm_induced(d_keep, d_traced * d_A * d_B, np.random.default_rng(component_seed(seed, component, extra_params.seeding)))
+
+
+@timed("state_draw")
+def generate_random_marginal_batch(d_A: int, d_B: int, keep: int, seeds: np.typing.NDArray, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS, component: Component = Component.STATE) -> np.typing.NDArray:
+    d_keep, d_traced = (d_A, d_B) if keep == 0 else (d_B, d_A)
+    return rand_dm_induced_batch(d_keep, d_traced * d_A * d_B, component_seeds(seeds, component, extra_params.seeding))
+
+
+@cached_artifact
+@timed("channel_draw")
+def generate_random_kraus_channel_batch(d_A: int, d_B: int, seeds: np.typing.NDArray, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> KrausChannel:
+    seeds = component_seeds(seeds, Component.GLOBAL_CHANNEL, extra_params.seeding)
+    if extra_params.global_channel_rank is not None:
+        return KrausChannel(rand_kraus_bcsz_leading_batch(d_A * d_B, extra_params.global_channel_rank, seeds))
+    return KrausChannel(rand_kraus_bcsz_batch(d_A * d_B, extra_params.superoperator_rank, seeds))
+
+
+@cached_artifact
+@timed("local_op_draw")
+def generate_random_local_kraus_channel_batch(d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> LocalKrausChannel:
+    subsystem = direction.to_local_index()
+    d = d_A if subsystem == 0 else d_B
+    seeds = component_seeds(seeds, Component.local_channel(subsystem), extra_params.seeding)
+    operators = rand_kraus_bcsz_batch(d, extra_params.superoperator_rank, seeds)
+    return LocalKrausChannel(operators, d_A, d_B, subsystem)
+
+
+def _draw_signaling_probability(d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> float:
+    if compute_params.engine == Engine.KRAUS:
+        initial_state = generate_random_dm_array(d_A, d_B, seed, extra_params)
+        local_channel = generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params)
+        global_channel = generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+        return _compute_signaling_probability_kraus(initial_state, local_channel, global_channel, d_A, d_B, direction)
+
+    initial_state = generate_random_dm(d_A, d_B, seed, extra_params)
+    local_operation = generate_random_local_channel(d_A, d_B, direction, seed, extra_params)
     global_superoperator = generate_random_superoperator(d_A, d_B, seed, extra_params)
-    tr_dist = _compute_signaling_probability(initial_state, local_operation, global_superoperator, direction)
+    return _compute_signaling_probability(initial_state, local_operation, global_superoperator, direction)
+
+
+def _draw_signaling_probability_batch(d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    initial_states = generate_random_dm_batch(d_A, d_B, seeds, extra_params)
+    local_channels = generate_random_local_kraus_channel_batch(d_A, d_B, direction, seeds, extra_params)
+    global_channels = generate_random_kraus_channel_batch(d_A, d_B, seeds, extra_params)
+    return np.asarray(_compute_signaling_probability_kraus(initial_states, local_channels, global_channels, d_A, d_B, direction))
+
+
+def _compute_signaling_probability_both_directions(
+    initial_state: qt.Qobj,
+    local_operation_A: LocalSuperoperator,
+    local_operation_B: LocalSuperoperator,
+    global_superoperator: qt.Qobj,
+) -> np.typing.NDArray:
+    # ρ and ℰ are shared between the directions; only the local operation and the traced-out subsystem differ.
+    tr_dists = []
+    for direction, local_operation in zip(BOTH_DIRECTIONS, (local_operation_A, local_operation_B)):
+        difference = initial_state - local_operation(initial_state)
+        reduced_final_difference = _qt_ptrace(_apply_superoperator(global_superoperator, difference), direction.to_ptrace_index())
+        tr_dists.append(0.5 * trace_norm(reduced_final_difference.full()))
+    return np.array(tr_dists)
+
+
+def _compute_signaling_probability_both_directions_kraus(
+    initial_state: np.typing.NDArray,
+    local_operation_A: LocalKrausChannel,
+    local_operation_B: LocalKrausChannel,
+    global_channel: KrausChannel,
+    d_A: int,
+    d_B: int,
+) -> np.typing.NDArray:
+    tr_dists = []
+    for direction, local_operation in zip(BOTH_DIRECTIONS, (local_operation_A, local_operation_B)):
+        difference = initial_state - local_operation(initial_state)
+        reduced_final_difference = global_channel.reduced(difference, d_A, d_B, direction.to_ptrace_index())
+        tr_dists.append(0.5 * trace_norm(reduced_final_difference))
+    return np.stack(tr_dists, axis=-1)
+
+
+def _draw_signaling_probability_both_directions(d_A: int, d_B: int, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> np.typing.NDArray:
+    if compute_params.engine == Engine.KRAUS:
+        initial_state = generate_random_dm_array(d_A, d_B, seed, extra_params)
+        local_channel_A, local_channel_B = (generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params) for direction in BOTH_DIRECTIONS)
+        global_channel = generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+        return _compute_signaling_probability_both_directions_kraus(initial_state, local_channel_A, local_channel_B, global_channel, d_A, d_B)
+
+    initial_state = generate_random_dm(d_A, d_B, seed, extra_params)
+    local_operation_A, local_operation_B = (generate_random_local_channel(d_A, d_B, direction, seed, extra_params) for direction in BOTH_DIRECTIONS)
+    global_superoperator = generate_random_superoperator(d_A, d_B, seed, extra_params)
+    return _compute_signaling_probability_both_directions(initial_state, local_operation_A, local_operation_B, global_superoperator)
+
+
+def _draw_signaling_probability_both_directions_batch(d_A: int, d_B: int, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    initial_states = generate_random_dm_batch(d_A, d_B, seeds, extra_params)
+    local_channels_A, local_channels_B = (generate_random_local_kraus_channel_batch(d_A, d_B, direction, seeds, extra_params) for direction in BOTH_DIRECTIONS)
+    global_channels = generate_random_kraus_channel_batch(d_A, d_B, seeds, extra_params)
+    return _compute_signaling_probability_both_directions_kraus(initial_states, local_channels_A, local_channels_B, global_channels, d_A, d_B)
+
+
+def _draw_seeds(
+    draw: Callable[[int], float | np.typing.NDArray],
+    draw_batch: Callable[[np.typing.NDArray], np.typing.NDArray],
+    seeds: np.typing.NDArray,
+    batch_size: int | None,
+) -> np.typing.NDArray:
+    # Runs in the worker processes when n_workers > 1. Each value depends on its seed only,
+    # so the result does not depend on how seeds are split into chunks.
+    if batch_size is None:
+        return np.array([draw(int(seed)) for seed in seeds])
+
+    return np.concatenate([draw_batch(seeds[start : start + batch_size]) for start in range(0, len(seeds), batch_size)])
+
+
+def _runs_chunked(compute_params: ComputeParams) -> bool:
+    return compute_params.batch_size is not None or (compute_params.n_workers or 1) > 1 or compute_params.adaptive
+
+
+def _split_into_chunks(indices: np.typing.NDArray, compute_params: ComputeParams) -> list[np.typing.NDArray]:
+    # One chunk per batch, or about eight chunks per worker so that uneven chunks still balance.
+    # Adaptive runs use chunks no longer than a stopping check so that little work is wasted past the stop.
+    n_workers = compute_params.n_workers or 1
+    chunk_size = compute_params.batch_size or max(1, -(-len(indices) // (8 * n_workers)))
+    if compute_params.adaptive and compute_params.batch_size is None:
+        chunk_size = min(chunk_size, ADAPTIVE_CHECK_EVERY)
+    return [indices[start : start + chunk_size] for start in range(0, len(indices), chunk_size)]
+
+
+def _process_pool(n_workers: int) -> ProcessPoolExecutor:
+    # Spawned rather than forked, since this process may hold cache compaction and BLAS threads.
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _expected_probabilities_chunked(
+    quantity: Quantity,
+    n_samples: int,
+    d_A: int,
+    d_B: int,
+    directions: list[Direction],
+    cache: Cache | None,
+    extra_params: ExtraParams,
+    compute_params: ComputeParams,
+    _initial_seed_state: int = 0,
+) -> np.typing.NDArray:
+    # Returns an (n_samples, len(directions)) array; all directions of a seed are computed from one draw.
+    # With adaptive stopping, only the rows of the seeds actually used are returned.
+    draw, draw_batch = _seed_draws(quantity, d_A, d_B, directions, extra_params, compute_params)
+    columns = [(direction, extra_params) for direction in directions]
+    desc = f"<{quantity.value}>_{', '.join(direction.value for direction in directions)}"
+    return _expected_columns_chunked(desc, n_samples, d_A, d_B, columns, draw, draw_batch, cache, compute_params, _initial_seed_state)
+
+
+def _expected_columns_chunked(
+    desc: str,
+    n_samples: int,
+    d_A: int,
+    d_B: int,
+    columns: list[tuple[Direction, ExtraParams]],
+    draw: Callable[[int], float | np.typing.NDArray],
+    draw_batch: Callable[[np.typing.NDArray], np.typing.NDArray],
+    cache: Cache | None,
+    compute_params: ComputeParams,
+    _initial_seed_state: int = 0,
+) -> np.typing.NDArray:
+    # Returns an (n_samples, len(columns)) array, where `draw` computes every column of a seed at once and each
+    # column is cached under its own (direction, extra_params) key.
+    seeds = np.arange(_initial_seed_state + 1, _initial_seed_state + n_samples + 1)
+    tr_dists = np.empty((n_samples, len(columns)))
+    missing = np.ones((n_samples, len(columns)), dtype=bool)
+
+    if cache is not None:
+        for j, (direction, extra_params) in enumerate(columns):
+            tr_dists[:, j], found = cache.get_many(d_A, d_B, direction, seeds, extra_params)
+            missing[:, j] = ~found
+
+    n_workers = compute_params.n_workers or 1
+    missing_idx = np.flatnonzero(missing.any(axis=1))
+    chunks = _split_into_chunks(missing_idx, compute_params)
+
+    def completed_chunks() -> Iterator[tuple[np.typing.NDArray, np.typing.NDArray]]:
+        if n_workers == 1:
+            for chunk in chunks:
+                yield chunk, _draw_seeds(draw, draw_batch, seeds[chunk], compute_params.batch_size)
+            return
+
+        # Only this process writes to the cache; workers just return their values.
+        pool = _process_pool(n_workers)
+        try:
+            futures = {pool.submit(_draw_seeds, draw, draw_batch, seeds[chunk], compute_params.batch_size): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Drop the queued chunks when adaptive stopping ends the loop early.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    stopping = None
+    if compute_params.adaptive:
+        stopping = AdaptiveStopping(n_samples, len(columns), compute_params.rtol, compute_params.time_budget, compute_params.min_samples)
+    available = ~missing.any(axis=1)
+
+    with tqdm(
+        total=n_samples,
+        initial=n_samples - len(missing_idx),
+        desc=f"Computing {desc} ({d_A=}, {d_B=}, {n_workers=})",
+        leave=False,
+    ) as progress:
+        chunk_results = completed_chunks()
+        if stopping is None or stopping.advance(tr_dists, available) is None:
+            for chunk, values in chunk_results:
+                values = values.reshape(len(chunk), len(columns))
+                tr_dists[chunk] = values
+                if cache is not None:
+                    for j, (direction, extra_params) in enumerate(columns):
+                        for i, tr_dist in zip(chunk[missing[chunk, j]].tolist(), values[missing[chunk, j], j].tolist()):
+                            cache.set(d_A, d_B, direction, int(seeds[i]), tr_dist, extra_params)
+                progress.update(len(chunk))
+
+                available[chunk] = True
+                if stopping is not None and stopping.advance(tr_dists, available) is not None:
+                    break
+        chunk_results.close()
+
+    if cache is not None:
+        cache.close()
+
+    if stopping is not None:
+        return tr_dists[: stopping.stop]
+    return tr_dists
 
-    if cache:
+
+def _one_shot_signaling_probability(
+    d_A: int,
+    d_B: int,
+    direction: Direction,
+    seed: int,
+    cache: Cache | None = SIGNALING_CACHE,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+) -> float:
+    if cache is not None and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)) is not None:
+        return cached_result
+
+    tr_dist = _draw_signaling_probability(d_A, d_B, direction, seed, extra_params, compute_params)
+
+    if cache is not None:
         cache.set(d_A, d_B, direction, seed, tr_dist, extra_params)
 
     return tr_dist
 
 
+@_recorded
 def expected_signaling_probability(
     n_samples: int,
     d_A: int,
@@ -74,8 +459,12 @@ def expected_signaling_probability(
     direction: Direction,
     cache: Cache | None = SIGNALING_CACHE,
     extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
     _initial_seed_state: int = 0,
 ) -> np.typing.NDArray:
+    if _runs_chunked(compute_params):
+        return _expected_probabilities_chunked(Quantity.SIGNALING, n_samples, d_A, d_B, [direction], cache, extra_params, compute_params, _initial_seed_state)[:, 0]
+
     seed = _initial_seed_state
     tr_dists: list[float] = []
 
@@ -89,7 +478,7 @@ def expected_signaling_probability(
     ):
         seed += 1
 
-        tr_dist = _one_shot_signaling_probability(d_A, d_B, direction, seed, cache, extra_params)
+        tr_dist = _one_shot_signaling_probability(d_A, d_B, direction, seed, cache, extra_params, compute_params)
         tr_dists.append(tr_dist)
 
     # Close the warmed cache to flush updates
@@ -100,33 +489,174 @@ def expected_signaling_probability(
 
 
 
+@_recorded
+def expected_signaling_probability_both_directions(
+    n_samples: int,
+    d_A: int,
+    d_B: int,
+    cache: Cache | None = SIGNALING_CACHE,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    _initial_seed_state: int = 0,
+) -> dict[Direction, np.typing.NDArray]:
+    # Same samples as calling expected_signaling_probability once per direction, from a single draw of ρ and ℰ per seed.
+    tr_dists = _expected_probabilities_chunked(Quantity.SIGNALING, n_samples, d_A, d_B, list(BOTH_DIRECTIONS), cache, extra_params, compute_params, _initial_seed_state)
+    return {direction: tr_dists[:, j] for j, direction in enumerate(BOTH_DIRECTIONS)}
+
+
+def _compute_signaling_probability_over_ranks(
+    initial_state: np.typing.NDArray,
+    local_operation: LocalKrausChannel,
+    global_ginibre: np.typing.NDArray,
+    d_A: int,
+    d_B: int,
+    direction: Direction,
+    ranks: list[int],
+) -> np.typing.NDArray:
+    # ρ - 𝒜(ρ) is formed once and pushed through the global channel of every rank; returns (..., len(ranks)).
+    difference = initial_state - local_operation(initial_state)
+    reduced_final_differences = reduced_outputs_over_ranks(global_ginibre, difference, d_A, d_B, direction.to_ptrace_index(), ranks)
+    return 0.5 * trace_norm(reduced_final_differences)
+
+
+def _draw_signaling_probability_over_ranks(d_A: int, d_B: int, direction: Direction, ranks: list[int], seed: int, extra_params: ExtraParams) -> np.typing.NDArray:
+    N = d_A * d_B
+    initial_state = generate_random_dm_array(d_A, d_B, seed, extra_params)
+    local_channel = generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params)
+    global_ginibre = ginibre((N**2, N**2), np.random.default_rng(component_seed(seed, Component.GLOBAL_CHANNEL, extra_params.seeding)))
+    return _compute_signaling_probability_over_ranks(initial_state, local_channel, global_ginibre, d_A, d_B, direction, ranks)
+
+
+def _draw_signaling_probability_over_ranks_batch(d_A: int, d_B: int, direction: Direction, ranks: list[int], seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    N = d_A * d_B
+    initial_states = generate_random_dm_batch(d_A, d_B, seeds, extra_params)
+    local_channels = generate_random_local_kraus_channel_batch(d_A, d_B, direction, seeds, extra_params)
+    global_ginibres = stacked_ginibre((N**2, N**2), component_seeds(seeds, Component.GLOBAL_CHANNEL, extra_params.seeding))
+    return _compute_signaling_probability_over_ranks(initial_states, local_channels, global_ginibres, d_A, d_B, direction, ranks)
+
+
+@_recorded
+def expected_signaling_probability_over_ranks(
+    n_samples: int,
+    d_A: int,
+    d_B: int,
+    direction: Direction,
+    ranks: list[int] | None = None,
+    cache: Cache | None = SIGNALING_CACHE,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    _initial_seed_state: int = 0,
+) -> dict[int, np.typing.NDArray]:
+    # Samples of the global channel ranks 1..(d_A·d_B)² by default. Each seed draws ρ, 𝒜 and the full-rank Ginibre matrix
+    # of ℰ once for all ranks, and rank r is cached under global_channel_rank=r with the same values as
+    # expected_signaling_probability at that rank. Always evaluated with the NumPy kernels.
+    ranks = sorted(set(ranks or range(1, (d_A * d_B) ** 2 + 1)))
+    columns = [(direction, replace(extra_params, global_channel_rank=rank)) for rank in ranks]
+    draw = partial(_draw_signaling_probability_over_ranks, d_A, d_B, direction, ranks, extra_params=extra_params)
+    draw_batch = partial(_draw_signaling_probability_over_ranks_batch, d_A, d_B, direction, ranks, extra_params=extra_params)
+    desc = f"<S>_{direction.value} over {len(ranks)} ranks"
+    tr_dists = _expected_columns_chunked(desc, n_samples, d_A, d_B, columns, draw, draw_batch, cache, compute_params, _initial_seed_state)
+    return {rank: tr_dists[:, j] for j, rank in enumerate(ranks)}
+
+
 # ------------------------------------------------------------
 #                            extra                        
 # ------------------------------------------------------------
 
 def _compute_transmission_probability(initial_state_one: qt.Qobj, initial_state_two: qt.Qobj, global_superoperator: qt.Qobj, direction: Direction) -> float:
-    final_state_one = global_superoperator(initial_state_one)
-    final_state_two = global_superoperator(initial_state_two)
-    reduced_final_state_one = qt.ptrace(final_state_one, direction.to_ptrace_index())
-    reduced_final_state_two = qt.ptrace(final_state_two, direction.to_ptrace_index())
-    tr_dist = qt.tracedist(reduced_final_state_one, reduced_final_state_two)
+    reduced_final_difference = _qt_ptrace(_apply_superoperator(global_superoperator, initial_state_one - initial_state_two), direction.to_ptrace_index())
+    tr_dist = 0.5 * trace_norm(reduced_final_difference.full())
     return tr_dist
 
 
-def _one_shot_transmission_probability(d_A: int, d_B: int, direction: Direction, seed: int, cache: Cache | None = TRANSMISSION_CACHE, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> float:
-    if cache and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)):
-        return cached_result
+def _compute_transmission_probability_kraus(
+    initial_state_one: np.typing.NDArray,
+    initial_state_two: np.typing.NDArray,
+    global_channel: KrausChannel,
+    d_A: int,
+    d_B: int,
+    direction: Direction,
+) -> float | np.typing.NDArray:
+    reduced_final_difference = global_channel.reduced(initial_state_one - initial_state_two, d_A, d_B, direction.to_ptrace_index())
+    tr_dist = 0.5 * trace_norm(reduced_final_difference)
+    return tr_dist
+
+
+def _draw_transmission_probability(d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> float:
+    if compute_params.engine == Engine.KRAUS:
+        initial_state_one = generate_random_dm_array(d_A, d_B, seed, extra_params)
+        initial_state_two = generate_random_dm_array(d_A, d_B, seed, extra_params, Component.SECOND_STATE)
+        global_channel = generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+        return _compute_transmission_probability_kraus(initial_state_one, initial_state_two, global_channel, d_A, d_B, direction)
 
-    initial_state_one = generate_random_dm(d_A, d_B, seed)
-    initial_state_two = generate_random_dm(d_A, d_B, seed + 1)
+    initial_state_one = generate_random_dm(d_A, d_B, seed, extra_params)
+    initial_state_two = generate_random_dm(d_A, d_B, seed, extra_params, Component.SECOND_STATE)
     global_superoperator = generate_random_superoperator(d_A, d_B, seed, extra_params)
-    tr_dist = _compute_transmission_probability(initial_state_one, initial_state_two, global_superoperator, direction)
+    return _compute_transmission_probability(initial_state_one, initial_state_two, global_superoperator, direction)
 
-    if cache:
+
+def _draw_transmission_probability_batch(d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    initial_states_one = generate_random_dm_batch(d_A, d_B, seeds, extra_params)
+    initial_states_two = generate_random_dm_batch(d_A, d_B, seeds, extra_params, Component.SECOND_STATE)
+    global_channels = generate_random_kraus_channel_batch(d_A, d_B, seeds, extra_params)
+    return np.asarray(_compute_transmission_probability_kraus(initial_states_one, initial_states_two, global_channels, d_A, d_B, direction))
+
+
+def _reduced_tracedists_both_directions(difference: qt.Qobj | np.typing.NDArray, d_A: int, d_B: int) -> np.typing.NDArray:
+    # Half the trace norms of the B and of the A marginals of a difference of states, for QuTiP operators or (batches of) arrays.
+    # Shared by the joint transmission (on the final states) and correlation (on the initial states) estimators.
+    tr_dists = []
+    for direction in BOTH_DIRECTIONS:
+        if isinstance(difference, np.ndarray):
+            tr_dists.append(0.5 * trace_norm(ptrace(difference, d_A, d_B, direction.to_ptrace_index())))
+        else:
+            tr_dists.append(0.5 * trace_norm(_qt_ptrace(difference, direction.to_ptrace_index()).full()))
+    return np.stack(tr_dists, axis=-1)
+
+
+def _channel_tracedists_both_directions(global_channel: KrausChannel, difference: np.typing.NDArray, d_A: int, d_B: int) -> np.typing.NDArray:
+    # Both marginals of ℰ(difference) from one K·difference product, in BOTH_DIRECTIONS order.
+    marginals = global_channel.marginals(difference, d_A, d_B)
+    return np.stack([0.5 * trace_norm(marginals[direction.to_ptrace_index()]) for direction in BOTH_DIRECTIONS], axis=-1)
+
+
+def _draw_transmission_probability_both_directions(d_A: int, d_B: int, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> np.typing.NDArray:
+    if compute_params.engine == Engine.KRAUS:
+        global_channel = generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+        difference = generate_random_dm_array(d_A, d_B, seed, extra_params) - generate_random_dm_array(d_A, d_B, seed, extra_params, Component.SECOND_STATE)
+        return _channel_tracedists_both_directions(global_channel, difference, d_A, d_B)
+
+    global_superoperator = generate_random_superoperator(d_A, d_B, seed, extra_params)
+    final_difference = _apply_superoperator(global_superoperator, generate_random_dm(d_A, d_B, seed, extra_params) - generate_random_dm(d_A, d_B, seed, extra_params, Component.SECOND_STATE))
+    return _reduced_tracedists_both_directions(final_difference, d_A, d_B)
+
+
+def _draw_transmission_probability_both_directions_batch(d_A: int, d_B: int, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    global_channels = generate_random_kraus_channel_batch(d_A, d_B, seeds, extra_params)
+    differences = generate_random_dm_batch(d_A, d_B, seeds, extra_params) - generate_random_dm_batch(d_A, d_B, seeds, extra_params, Component.SECOND_STATE)
+    return _channel_tracedists_both_directions(global_channels, differences, d_A, d_B)
+
+
+def _one_shot_transmission_probability(
+    d_A: int,
+    d_B: int,
+    direction: Direction,
+    seed: int,
+    cache: Cache | None = TRANSMISSION_CACHE,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+) -> float:
+    if cache is not None and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)) is not None:
+        return cached_result
+
+    tr_dist = _draw_transmission_probability(d_A, d_B, direction, seed, extra_params, compute_params)
+
+    if cache is not None:
         cache.set(d_A, d_B, direction, seed, tr_dist, extra_params)
 
     return tr_dist
 
+@_recorded
 def expected_transmission_probability(
     n_samples: int,
     d_A: int,
@@ -134,8 +664,12 @@ def expected_transmission_probability(
     direction: Direction,
     cache: Cache | None = TRANSMISSION_CACHE,
     extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
     _initial_seed_state: int = 0,
 ) -> np.typing.NDArray:
+    if _runs_chunked(compute_params):
+        return _expected_probabilities_chunked(Quantity.TRANSMISSION, n_samples, d_A, d_B, [direction], cache, extra_params, compute_params, _initial_seed_state)[:, 0]
+
     seed = _initial_seed_state
     tr_dists: list[float] = []
 
@@ -148,7 +682,7 @@ def expected_transmission_probability(
         leave=False,
     ):
         seed += 1
-        tr_dist = _one_shot_transmission_probability(d_A, d_B, direction, seed, cache, extra_params)
+        tr_dist = _one_shot_transmission_probability(d_A, d_B, direction, seed, cache, extra_params, compute_params)
         tr_dists.append(tr_dist)
 
     if cache is not None:
@@ -159,25 +693,65 @@ def expected_transmission_probability(
 
 
 def _compute_correlation_probability(initial_state_one: qt.Qobj, initial_state_two: qt.Qobj, direction: Direction) -> float:
-    reduced_initial_state_one = qt.ptrace(initial_state_one, direction.to_ptrace_index())
-    reduced_initial_state_two = qt.ptrace(initial_state_two, direction.to_ptrace_index())
-    tr_dist = qt.tracedist(reduced_initial_state_one, reduced_initial_state_two)
+    reduced_initial_difference = _qt_ptrace(initial_state_one - initial_state_two, direction.to_ptrace_index())
+    tr_dist = 0.5 * trace_norm(reduced_initial_difference.full())
     return tr_dist
 
+def _draw_correlation_probability_induced(d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams) -> float:
+    # Each marginal has its own generators, so a seed gives the same value alone and in both-directions runs.
+    keep = direction.to_ptrace_index()
+    difference = generate_random_marginal(d_A, d_B, keep, seed, extra_params) - generate_random_marginal(d_A, d_B, keep, seed, extra_params, Component.SECOND_STATE)
+    return float(0.5 * trace_norm(difference))
+
+
+def _draw_correlation_probability_induced_batch(d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    keep = direction.to_ptrace_index()
+    differences = generate_random_marginal_batch(d_A, d_B, keep, seeds, extra_params) - generate_random_marginal_batch(d_A, d_B, keep, seeds, extra_params, Component.SECOND_STATE)
+    return 0.5 * trace_norm(differences)
+
+
+def _draw_correlation_probability_batch(d_A: int, d_B: int, direction: Direction, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    if extra_params.induced_marginals:
+        return _draw_correlation_probability_induced_batch(d_A, d_B, direction, seeds, extra_params)
+    differences = generate_random_dm_batch(d_A, d_B, seeds, extra_params) - generate_random_dm_batch(d_A, d_B, seeds, extra_params, Component.SECOND_STATE)
+    return 0.5 * trace_norm(ptrace(differences, d_A, d_B, direction.to_ptrace_index()))
+
+
+def _draw_correlation_probability(d_A: int, d_B: int, direction: Direction, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> float:
+    if extra_params.induced_marginals:
+        return _draw_correlation_probability_induced(d_A, d_B, direction, seed, extra_params)
+    initial_state_one = generate_random_dm(d_A, d_B, seed, extra_params)
+    initial_state_two = generate_random_dm(d_A, d_B, seed, extra_params, Component.SECOND_STATE)
+    return _compute_correlation_probability(initial_state_one, initial_state_two, direction)
+
+
+def _draw_correlation_probability_both_directions(d_A: int, d_B: int, seed: int, extra_params: ExtraParams, compute_params: ComputeParams) -> np.typing.NDArray:
+    if extra_params.induced_marginals:
+        return np.array([_draw_correlation_probability_induced(d_A, d_B, direction, seed, extra_params) for direction in BOTH_DIRECTIONS])
+    initial_state_one = generate_random_dm(d_A, d_B, seed, extra_params)
+    initial_state_two = generate_random_dm(d_A, d_B, seed, extra_params, Component.SECOND_STATE)
+    return _reduced_tracedists_both_directions(initial_state_one - initial_state_two, d_A, d_B)
+
+
+def _draw_correlation_probability_both_directions_batch(d_A: int, d_B: int, seeds: np.typing.NDArray, extra_params: ExtraParams) -> np.typing.NDArray:
+    if extra_params.induced_marginals:
+        return np.stack([_draw_correlation_probability_induced_batch(d_A, d_B, direction, seeds, extra_params) for direction in BOTH_DIRECTIONS], axis=-1)
+    return _reduced_tracedists_both_directions(generate_random_dm_batch(d_A, d_B, seeds, extra_params) - generate_random_dm_batch(d_A, d_B, seeds, extra_params, Component.SECOND_STATE), d_A, d_B)
+
+
 def _one_shot_correlation_probability(d_A: int, d_B: int, direction: Direction, seed: int, cache: Cache | None = CORRELATION_CACHE, extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS) -> float:
-    if cache and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)):
+    if cache is not None and (cached_result := cache.get(d_A, d_B, direction, seed, extra_params)) is not None:
         return cached_result
 
-    initial_state_one = generate_random_dm(d_A, d_B, seed)
-    initial_state_two = generate_random_dm(d_A, d_B, seed + 1)
-    tr_dist = _compute_correlation_probability(initial_state_one, initial_state_two, direction)
+    tr_dist = _draw_correlation_probability(d_A, d_B, direction, seed, extra_params, DEFAULT_COMPUTE_PARAMS)
 
-    if cache:
+    if cache is not None:
         cache.set(d_A, d_B, direction, seed, tr_dist, extra_params)
 
     return tr_dist
 
 
+@_recorded
 def expected_correlation_probability(
     n_samples: int,
     d_A: int,
@@ -185,8 +759,12 @@ def expected_correlation_probability(
     direction: Direction,
     cache: Cache | None = CORRELATION_CACHE,
     extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
     _initial_seed_state: int = 0,
 ) -> np.typing.NDArray:
+    if _runs_chunked(compute_params):
+        return _expected_probabilities_chunked(Quantity.CORRELATION, n_samples, d_A, d_B, [direction], cache, extra_params, compute_params, _initial_seed_state)[:, 0]
+
     seed = _initial_seed_state
     tr_dists: list[float] = []
 
@@ -205,4 +783,61 @@ def expected_correlation_probability(
     if cache is not None:
         cache.close()
 
-    return np.array(tr_dists)
\ No newline at end of file
+    return np.array(tr_dists)
+
+
+@dataclass(frozen=True)
+class _Estimator:
+    draw: Callable[..., float]
+    draw_batch: Callable[..., np.typing.NDArray]
+    draw_both_directions: Callable[..., np.typing.NDArray]
+    draw_both_directions_batch: Callable[..., np.typing.NDArray]
+    cache: Cache
+
+
+_ESTIMATORS: dict[Quantity, _Estimator] = {
+    Quantity.SIGNALING: _Estimator(
+        _draw_signaling_probability,
+        _draw_signaling_probability_batch,
+        _draw_signaling_probability_both_directions,
+        _draw_signaling_probability_both_directions_batch,
+        SIGNALING_CACHE,
+    ),
+    Quantity.TRANSMISSION: _Estimator(
+        _draw_transmission_probability,
+        _draw_transmission_probability_batch,
+        _draw_transmission_probability_both_directions,
+        _draw_transmission_probability_both_directions_batch,
+        TRANSMISSION_CACHE,
+    ),
+    Quantity.CORRELATION: _Estimator(
+        _draw_correlation_probability,
+        _draw_correlation_probability_batch,
+        _draw_correlation_probability_both_directions,
+        _draw_correlation_probability_both_directions_batch,
+        CORRELATION_CACHE,
+    ),
+}
+
+
+def _seed_draws(
+    quantity: Quantity,
+    d_A: int,
+    d_B: int,
+    directions: list[Direction],
+    extra_params: ExtraParams,
+    compute_params: ComputeParams,
+) -> tuple[Callable[[int], float | np.typing.NDArray], Callable[[np.typing.NDArray], np.typing.NDArray]]:
+    # Per-seed and batched draws with everything but the seed(s) bound; picklable for the worker processes.
+    estimator = _ESTIMATORS[quantity]
+    if tuple(directions) == BOTH_DIRECTIONS:
+        return (
+            partial(estimator.draw_both_directions, d_A, d_B, extra_params=extra_params, compute_params=compute_params),
+            partial(estimator.draw_both_directions_batch, d_A, d_B, extra_params=extra_params),
+        )
+
+    (direction,) = directions
+    return (
+        partial(estimator.draw, d_A, d_B, direction, extra_params=extra_params, compute_params=compute_params),
+        partial(estimator.draw_batch, d_A, d_B, direction, extra_params=extra_params),
+    )
@@ -1,9 +1,50 @@
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.seeding import Seeding
 from dataclasses import dataclass
+from pathlib import Path
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExtraParams:
     superoperator_rank: int | None = None
+    seeding: Seeding | None = None  # None keeps the original Seeding.SHARED draws (and cache files)
+    # Rank of the global channel only, taken as the leading Kraus columns of its full-rank Ginibre draw, so that one
+    # draw per seed is shared by every rank (see expected_signaling_probability_over_ranks). Overrides
+    # superoperator_rank for the global channel.
+    global_channel_rank: int | None = None
+    # ⟨C⟩ only: draw the reduced initial states directly from their induced distribution instead of partial-tracing
+    # full d_A·d_B states. Same distribution, different draws per seed, hence its own cache files.
+    induced_marginals: bool | None = None
+
+
+# Settings that change how samples are computed but not their values, so they are not part of the cache key.
+@dataclass
+class ComputeParams:
+    engine: Engine = Engine.QUTIP
+    batch_size: int | None = None  # evaluate this many seeds at once with the stacked NumPy (Kraus) kernels
+    n_workers: int | None = None  # shard seeds over a process pool of this size
+    # Adaptive stopping: n_samples becomes an upper bound and seeds 1..k are used for the first k at which
+    # the standard error of the mean is within `rtol` of the mean, or at which `time_budget` seconds have passed.
+    rtol: float | None = None
+    time_budget: float | None = None
+    min_samples: int = 100
+    sample_retention: SampleRetention = SampleRetention.ALL  # what the resulting Stats keep of the samples
+    # Instrumentation (see utils/instrumentation.py): the expected_* estimators write a JSON report of phase timers,
+    # cache counters and samples per second, and/or a cProfile file, when these are set.
+    report: Path | None = None
+    profile: Path | None = None
+
+    def __post_init__(self):
+        if self.time_budget is not None and self.time_budget < 0:
+            raise ValueError(f"time_budget={self.time_budget} must be non-negative")
+        if self.min_samples < 1:
+            raise ValueError(f"min_samples={self.min_samples} must be at least 1")
+
+    @property
+    def adaptive(self) -> bool:
+        return self.rtol is not None or self.time_budget is not None
 
 
 DEFAULT_EXTRA_PARAMS = ExtraParams()
+DEFAULT_COMPUTE_PARAMS = ComputeParams()
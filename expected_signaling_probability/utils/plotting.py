@@ -1,4 +1,5 @@
 from expected_signaling_probability.utils.fitting import fit_power_law
+from expected_signaling_probability.utils.bootstrap import bootstrap_power_law, can_resample
 from expected_signaling_probability.utils.stats import Stats
 from matplotlib.ticker import ScalarFormatter, NullFormatter
 from dataclasses import dataclass
@@ -230,20 +231,29 @@ def plot_power_law_fit(
     probability_label: str,
     dim_var: str = "d",
     d_fit_min: int | None = None,
+    all_stats: list[Stats] | None = None,
+    n_bootstrap: int = 0,
 ):
-    if d_fit_min is not None:
-        mask = x >= d_fit_min
-        x_fit_data, y_fit_data = x[mask], y[mask]
-    else:
-        x_fit_data, y_fit_data = x, y
-
-    fit = fit_power_law(x_fit_data, y_fit_data)
+    # With the cells' Stats, the means are weighted by their standard errors. The ± on the exponent is the regression
+    # stderr of the means, unless `n_bootstrap` replicates are asked for and the Stats have samples or histograms: then
+    # it is the bootstrap standard error, which includes the Monte-Carlo error of every mean. Opt-in, as it takes about
+    # a second per curve, and histograms (SampleRetention.HISTOGRAM) are only resampled at their bin centres.
+    mask = x >= d_fit_min if d_fit_min is not None else np.ones(len(x), dtype=bool)
+    x_fit_data, y_fit_data = x[mask], y[mask]
+    fit_stats = [s for s, keep in zip(all_stats, mask) if keep] if all_stats is not None else None
+    sem = np.array([s.sem for s in fit_stats]) if fit_stats is not None else None
+    weighted = sem is not None and bool(np.all((sem > 0) & np.isfinite(sem)))
+
+    fit = fit_power_law(x_fit_data, y_fit_data, sem if weighted else None)
+    slope_error = fit.stderr
+    if n_bootstrap > 0 and fit_stats is not None and all(can_resample(s) for s in fit_stats):
+        slope_error = bootstrap_power_law(fit_stats, n_replicates=n_bootstrap, weighted=weighted).slope_se
 
     if _active_config.show_title:
         fit_range = rf" (${dim_var} \geq {d_fit_min}$)" if d_fit_min is not None else ""
-        fit_label = rf"Fit{fit_range}: {probability_label} $ \propto {dim_var}^{{{fit.slope:.2f} \pm {fit.stderr:.2f}}}$"
+        fit_label = rf"Fit{fit_range}: {probability_label} $ \propto {dim_var}^{{{fit.slope:.2f} \pm {slope_error:.2f}}}$"
     else:
-        fit_label = rf"{probability_label} $ \propto {dim_var}^{{{fit.slope:.2f} \pm {fit.stderr:.2f}}}$"
+        fit_label = rf"{probability_label} $ \propto {dim_var}^{{{fit.slope:.2f} \pm {slope_error:.2f}}}$"
 
     plt.plot(
         fit.x_fit,
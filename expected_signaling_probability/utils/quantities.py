@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Quantity(Enum):
+    SIGNALING = "S"
+    TRANSMISSION = "T"
+    CORRELATION = "C"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class SampleRetention(Enum):
+    ALL = "all"  # keep the full sample array in Stats.samples
+    RESERVOIR = "reservoir"  # keep a fixed-size uniform subsample, in seed order
+    HISTOGRAM = "histogram"  # keep a fixed-size histogram instead of samples
+    NONE = "none"  # keep only the summary values
@@ -0,0 +1,58 @@
+from collections.abc import Iterator
+from enum import Enum, IntEnum
+import numpy as np
+
+
+class Seeding(Enum):
+    SHARED = "shared"  # every component is drawn from default_rng(seed); the second state of T and C from default_rng(seed + 1)
+    STREAMS = "streams"  # one independent Philox stream per (seed, component)
+
+
+class Component(IntEnum):
+    STATE = 0
+    SECOND_STATE = 1
+    LOCAL_CHANNEL_A = 2
+    LOCAL_CHANNEL_B = 3
+    GLOBAL_CHANNEL = 4
+
+    @classmethod
+    def local_channel(cls, subsystem: int) -> "Component":
+        return cls.LOCAL_CHANNEL_A if subsystem == 0 else cls.LOCAL_CHANNEL_B
+
+
+class _KeyedPhilox:
+    # Philox is counter-based: the key (seed, component) selects an independent stream and the counter its position.
+    # Re-keying one bit generator in place is ~5x cheaper than constructing a generator per draw. The returned
+    # Generator is shared, so each one must be used up before the next call (every process gets its own).
+    def __init__(self):
+        self._bit_generator = np.random.Philox(key=0)
+        self._state = self._bit_generator.state
+        self.generator = np.random.Generator(self._bit_generator)
+
+    def __call__(self, seed: int, component: Component) -> np.random.Generator:
+        state = self._state
+        state["state"]["counter"][:] = 0
+        state["state"]["key"][:] = (seed, component)
+        state["buffer_pos"] = len(state["buffer"])  # discard buffered output of the previous stream
+        state["has_uint32"] = 0
+        self._bit_generator.state = state
+        return self.generator
+
+
+_STREAMS = _KeyedPhilox()
+
+
+def component_seed(seed: int | None, component: Component, seeding: Seeding | None) -> int | np.random.Generator | None:
+    # What to pass as `seed` to qt.rand_* / np.random.default_rng for one component of one sample.
+    if seed is None:
+        return None
+    if seeding == Seeding.STREAMS:
+        return _STREAMS(int(seed), component)
+    return seed + 1 if component == Component.SECOND_STATE else seed
+
+
+def component_seeds(seeds: np.typing.NDArray, component: Component, seeding: Seeding | None) -> np.typing.NDArray | Iterator[np.random.Generator]:
+    # Batched variant; the stream generators are produced lazily, one at a time, as the kernels consume them.
+    if seeding == Seeding.STREAMS:
+        return (_STREAMS(int(seed), component) for seed in seeds)
+    return seeds + 1 if component == Component.SECOND_STATE else seeds
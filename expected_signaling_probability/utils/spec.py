@@ -0,0 +1,121 @@
+from expected_signaling_probability.utils.params import ExtraParams, ComputeParams
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.seeding import Seeding
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.sweep import SweepCell
+from expected_signaling_probability.utils.stats import Stats
+from dataclasses import dataclass, fields
+from pathlib import Path
+from enum import Enum
+import tomllib
+import json
+import os
+
+
+class Geometry(Enum):
+    SYMMETRIC = "symmetric"  # d_A = d_B = d for d in [d_min, d_max]
+    ASYMMETRIC = "asymmetric"  # d_A in [d_min, d_max] at fixed d_B
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    # Declarative description of one sweep, read from a TOML or JSON file (see load_spec).
+    quantity: Quantity
+    geometry: Geometry
+    d_min: int
+    d_max: int
+    n_samples: int
+    d_B: int | None = None  # asymmetric sweeps only
+    directions: tuple[Direction, ...] = (Direction.A_TO_B,)
+    rank: int | None = None
+    seeding: Seeding | None = None
+    induced_marginals: bool | None = None  # C only, see ExtraParams
+    engine: Engine = Engine.QUTIP
+    n_workers: int | None = None  # None uses every core
+    batch_size: int | None = None
+    rtol: float | None = None
+    time_budget: float | None = None
+    d_fit_min: int | None = None
+    plot_mode: str = "explore"
+
+    def __post_init__(self):
+        if self.d_min > self.d_max:
+            raise ValueError(f"d_min={self.d_min} is larger than d_max={self.d_max}")
+        if self.geometry == Geometry.ASYMMETRIC and self.d_B is None:
+            raise ValueError("An asymmetric sweep needs d_B")
+
+    @property
+    def extra_params(self) -> ExtraParams:
+        return ExtraParams(superoperator_rank=self.rank, seeding=self.seeding, induced_marginals=self.induced_marginals)
+
+    @property
+    def compute_params(self) -> ComputeParams:
+        return ComputeParams(
+            engine=self.engine,
+            batch_size=self.batch_size,
+            n_workers=self.n_workers or os.cpu_count(),
+            rtol=self.rtol,
+            time_budget=self.time_budget,
+            sample_retention=SampleRetention.HISTOGRAM,
+        )
+
+    def cells(self) -> list[SweepCell]:
+        dims = range(self.d_min, self.d_max + 1)
+        if self.geometry == Geometry.SYMMETRIC:
+            pairs = [(d, d) for d in dims]
+        else:
+            pairs = [(d_A, self.d_B) for d_A in dims]
+        return [SweepCell(self.quantity, d_A, d_B, direction, self.n_samples, self.extra_params) for direction in self.directions for d_A, d_B in pairs]
+
+    def to_dict(self) -> dict:
+        spec = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.name == "directions":
+                value = [direction.to_str() for direction in value]
+            elif isinstance(value, Enum):
+                value = value.value
+            spec[field.name] = value
+        return spec
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "SweepSpec":
+        unknown = set(spec) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown sweep spec keys: {sorted(unknown)}")
+        spec = dict(spec)
+        spec["quantity"] = Quantity(spec["quantity"])
+        spec["geometry"] = Geometry(spec.get("geometry", Geometry.SYMMETRIC.value))
+        if "directions" in spec:
+            spec["directions"] = tuple(Direction.from_str(direction) for direction in spec["directions"])
+        if spec.get("seeding") is not None:
+            spec["seeding"] = Seeding(spec["seeding"])
+        if "engine" in spec:
+            spec["engine"] = Engine(spec["engine"])
+        return cls(**spec)
+
+
+def load_spec(path: Path) -> SweepSpec:
+    path = Path(path)
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            return SweepSpec.from_dict(tomllib.load(f))
+    with open(path) as f:
+        return SweepSpec.from_dict(json.load(f))
+
+
+def write_summary(path: Path, spec: SweepSpec, results: list[tuple[SweepCell, Stats]]) -> None:
+    # Written atomically, so a summary on disk is always complete for the cells it lists.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summary = {"spec": spec.to_dict(), "cells": [stats.to_dict() | {"quantity": cell.quantity.value} for cell, stats in results]}
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    tmp_file.write_text(json.dumps(summary, indent=2))
+    os.replace(tmp_file, path)
+
+
+def load_summary(path: Path) -> tuple[SweepSpec, list[Stats]]:
+    summary = json.loads(Path(path).read_text())
+    return SweepSpec.from_dict(summary["spec"]), [Stats.from_dict(cell) for cell in summary["cells"]]
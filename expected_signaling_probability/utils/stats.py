@@ -1,6 +1,8 @@
+from expected_signaling_probability.utils.retention import SampleRetention
 from expected_signaling_probability.utils.directions import Direction
 from dataclasses import dataclass
 import numpy as np
+import time
 
 
 @dataclass
@@ -18,6 +20,7 @@ class Stats:
     d_A: int
     d_B: int
     direction: Direction
+    histogram: tuple[np.typing.NDArray, np.typing.NDArray] | None = None  # (counts, bin edges) under SampleRetention.HISTOGRAM
 
     def __str__(self) -> str:
         attrs = []
@@ -25,21 +28,251 @@ class Stats:
             value = getattr(self, field)
             if field == "samples":
                 value = f"array with shape {self.samples.shape}"
+            if field == "histogram" and value is not None:
+                value = f"{len(value[0])} bins"
             attrs.append(f"{field}={value}")
         return f"Stats({', '.join(attrs)})"
 
+    @property
+    def sem(self) -> float:
+        # Standard error of the mean, using the unbiased sample variance (as StreamingStats.sem).
+        if self.n < 2:
+            return float("inf")
+        return float(np.sqrt(self.var / (self.n - 1)))
 
-def statistics(samples: np.typing.NDArray, **kwargs) -> Stats:
+    def to_dict(self) -> dict:
+        # JSON-ready summary without the samples.
+        summary = {name: float(getattr(self, name)) for name in _SUMMARY_FIELDS}
+        summary.update(n=self.n, d_A=self.d_A, d_B=self.d_B, direction=self.direction.to_str())
+        if self.histogram is not None:
+            summary["histogram"] = {"counts": self.histogram[0].tolist(), "edges": self.histogram[1].tolist()}
+        return summary
+
+    @classmethod
+    def from_dict(cls, summary: dict) -> "Stats":
+        histogram = summary.get("histogram")
+        return cls(
+            **{name: np.float64(summary[name]) for name in _SUMMARY_FIELDS},
+            n=summary["n"],
+            samples=np.empty(0),
+            d_A=summary["d_A"],
+            d_B=summary["d_B"],
+            direction=Direction.from_str(summary["direction"]),
+            histogram=(np.array(histogram["counts"]), np.array(histogram["edges"])) if histogram else None,
+        )
+
+
+_SUMMARY_FIELDS = ("mean", "median", "q25", "q75", "std", "var", "min", "max")
+
+
+RESERVOIR_SIZE = 1024
+HISTOGRAM_BINS = 64
+
+
+def _retain(samples: np.typing.NDArray, retention: SampleRetention) -> tuple[np.typing.NDArray, tuple[np.typing.NDArray, np.typing.NDArray] | None]:
+    if retention == SampleRetention.ALL:
+        return samples, None
+    if retention == SampleRetention.RESERVOIR:
+        if len(samples) <= RESERVOIR_SIZE:
+            return samples.copy(), None
+        # Fixed generator, so the same samples always keep the same subsample.
+        keep = np.sort(np.random.default_rng(0).choice(len(samples), RESERVOIR_SIZE, replace=False))
+        return samples[keep], None
+    if retention == SampleRetention.HISTOGRAM:
+        return np.empty(0), np.histogram(samples, bins=HISTOGRAM_BINS)
+    return np.empty(0), None
+
+
+def statistics(samples: np.typing.NDArray, retention: SampleRetention = SampleRetention.ALL, **kwargs) -> Stats:
+    # All order statistics come from a single np.quantile call, i.e. one partition of one copy.
+    min_, q25, median, q75, max_ = np.quantile(samples, [0, 0.25, 0.5, 0.75, 1])
+    mean = np.mean(samples)
+    var = np.mean(np.abs(samples - mean) ** 2)
+    kept, histogram = _retain(samples, retention)
     return Stats(
-        mean=np.mean(samples),
-        median=np.median(samples),
-        q25=np.percentile(samples, 25),
-        q75=np.percentile(samples, 75),
-        std=np.std(samples),
-        var=np.var(samples),
-        min=np.min(samples),
-        max=np.max(samples),
+        mean=mean,
+        median=median,
+        q25=q25,
+        q75=q75,
+        std=np.sqrt(var),
+        var=var,
+        min=min_,
+        max=max_,
         n=len(samples),
-        samples=samples,
+        samples=kept,
+        histogram=histogram,
         **kwargs,
     )
+
+
+class P2Quantile:
+    # P² single-quantile estimator (Jain & Chlamtac, 1985): five markers, O(1) memory per quantile.
+    def __init__(self, p: float):
+        self.p = p
+        self._heights: list[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x: float) -> None:
+        q = self._heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            delta = self._desired[i] - n[i]
+            if (delta >= 1 and n[i + 1] - n[i] > 1) or (delta <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if delta > 0 else -1
+                parabolic = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    @property
+    def value(self) -> float:
+        if len(self._heights) < 5:
+            # Too few samples for the markers; fall back to the exact quantile.
+            return float(np.quantile(self._heights, self.p)) if self._heights else float("nan")
+        return self._heights[2]
+
+
+class StreamingStats:
+    # Welford mean/variance and P² quartiles, updated one chunk at a time without keeping the samples. The P² update is
+    # a Python loop over the values, so `quantiles=False` skips it where only the mean and sem are needed.
+    def __init__(self, quantiles: bool = True):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._quantiles = {p: P2Quantile(p) for p in (0.25, 0.5, 0.75)} if quantiles else {}
+
+    def update(self, values: np.typing.NDArray) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return
+
+        # Chan et al. merge of the chunk's moments into the running ones.
+        n_chunk = len(values)
+        mean_chunk = float(np.mean(values))
+        m2_chunk = float(np.sum((values - mean_chunk) ** 2))
+        n_total = self.n + n_chunk
+        delta = mean_chunk - self.mean
+        self.mean += delta * n_chunk / n_total
+        self._m2 += m2_chunk + delta**2 * self.n * n_chunk / n_total
+        self.n = n_total
+
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+        if self._quantiles:
+            for value in values.tolist():
+                for quantile in self._quantiles.values():
+                    quantile.update(value)
+
+    @property
+    def var(self) -> float:
+        return self._m2 / self.n if self.n else float("nan")
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+    @property
+    def sem(self) -> float:
+        # Standard error of the mean, using the unbiased sample variance.
+        if self.n < 2:
+            return float("inf")
+        return float(np.sqrt(self._m2 / (self.n - 1) / self.n))
+
+    def _quantile(self, p: float) -> float:
+        return self._quantiles[p].value if self._quantiles else float("nan")
+
+    def to_stats(self, samples: np.typing.NDArray | None = None, **kwargs) -> Stats:
+        return Stats(
+            mean=np.float64(self.mean),
+            median=np.float64(self._quantile(0.5)),
+            q25=np.float64(self._quantile(0.25)),
+            q75=np.float64(self._quantile(0.75)),
+            std=np.float64(self.std),
+            var=np.float64(self.var),
+            min=np.float64(self.min),
+            max=np.float64(self.max),
+            n=self.n,
+            samples=samples if samples is not None else np.empty(0),
+            **kwargs,
+        )
+
+
+# Adaptive runs test the stopping criteria only after multiples of this many seeds, so the number of
+# samples used under `rtol` does not depend on chunking, worker count or what was already cached.
+ADAPTIVE_CHECK_EVERY = 50
+
+
+class AdaptiveStopping:
+    # Consumes per-seed values in seed order as they become available (chunks may complete out of order)
+    # and stops once every column's standard error is below `rtol` relative to its mean, or the time budget runs out.
+    def __init__(self, n_samples: int, n_columns: int, rtol: float | None, time_budget: float | None, min_samples: int):
+        self.n_samples = n_samples
+        self.rtol = rtol
+        self.time_budget = time_budget
+        self.min_samples = min_samples
+        # Only the mean and sem decide the stop; the final Stats, quartiles included, come from statistics().
+        self.accumulators = [StreamingStats(quantiles=False) for _ in range(n_columns)]
+        self.prefix = 0  # seeds [0, prefix) have been fed to the accumulators
+        self.stop: int | None = None
+        self.budget_stopped = False  # stopped by the time budget rather than by rtol or after n_samples seeds
+        self._start = time.monotonic()
+
+    def _converged(self) -> bool:
+        if self.rtol is None or self.prefix < self.min_samples:
+            return False
+        return all(acc.sem <= self.rtol * abs(acc.mean) for acc in self.accumulators)
+
+    def _feed(self, values: np.typing.NDArray, end: int) -> None:
+        for j, acc in enumerate(self.accumulators):
+            acc.update(values[self.prefix : end, j])
+        self.prefix = end
+
+    def advance(self, values: np.typing.NDArray, available: np.typing.NDArray) -> int | None:
+        # `values` is (n_samples, n_columns); `available[i]` marks seeds whose values are final. Returns the stop index once decided.
+        if self.stop is not None:
+            return self.stop
+
+        unavailable = np.flatnonzero(~available[self.prefix :])
+        end = self.prefix + unavailable[0] if len(unavailable) else self.n_samples
+        while self.prefix < end:
+            checkpoint = min((self.prefix // ADAPTIVE_CHECK_EVERY + 1) * ADAPTIVE_CHECK_EVERY, end)
+            self._feed(values, checkpoint)
+            if checkpoint % ADAPTIVE_CHECK_EVERY == 0 and self._converged():
+                self.stop = self.prefix
+                return self.stop
+
+        if self.prefix == self.n_samples:
+            self.stop = self.n_samples
+        elif self.time_budget is not None and self.prefix >= max(self.min_samples, 1) and time.monotonic() - self._start > self.time_budget:
+            # The budget never ends a column with fewer than min_samples seeds.
+            self.stop = self.prefix
+            self.budget_stopped = True
+        return self.stop
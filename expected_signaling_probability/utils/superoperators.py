@@ -0,0 +1,46 @@
+from __future__ import annotations
+from expected_signaling_probability.utils.lazy import lazy_import
+from expected_signaling_probability.utils.instrumentation import timed
+from expected_signaling_probability.utils.data_layers import DataLayer
+from dataclasses import dataclass, field
+import numpy as np
+
+qt = lazy_import("qutip")
+
+
+@dataclass
+class LocalSuperoperator:
+    superoperator: qt.Qobj  # (d², d²) superoperator on the dimension d of `subsystem`
+    d_A: int
+    d_B: int
+    subsystem: int  # 0 acts on A, 1 acts on B
+    data_layer: DataLayer = DataLayer.DENSE  # see data_layers.local_layer
+    _tensored: qt.Qobj | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # The CSR layer applies the tensored superoperator, built once here rather than on every call.
+        if self.data_layer == DataLayer.CSR:
+            self._tensored = self.tensored()
+
+    def tensored(self) -> qt.Qobj:
+        # The (d_A·d_B)² x (d_A·d_B)² superoperator on the whole state, in CSR: a fraction 1/d_other² of it is non-zero.
+        identity = qt.to_super(qt.identity(self.d_B if self.subsystem == 0 else self.d_A))
+        factors = (self.superoperator, identity) if self.subsystem == 0 else (identity, self.superoperator)
+        return qt.super_tensor(*factors).to(DataLayer.CSR.value)
+
+    @timed("local_op")
+    def __call__(self, state: qt.Qobj) -> qt.Qobj:
+        if self.data_layer == DataLayer.CSR:
+            return self._tensored(state)
+        # Same result as super_tensor(superoperator, to_super(identity)) applied to `state`, contracted
+        # on the (d_A, d_B, d_A, d_B) tensor. QuTiP superoperators act on column-stacked vectors, so
+        # the reshaped superoperator is indexed [out col, out row, in col, in row].
+        d = self.d_A if self.subsystem == 0 else self.d_B
+        S = self.superoperator.full().reshape(d, d, d, d)
+        rho = state.full().reshape(self.d_A, self.d_B, self.d_A, self.d_B)
+        if self.subsystem == 0:
+            out = np.einsum("yxca,abcd->xbyd", S, rho)
+        else:
+            out = np.einsum("yxdb,abcd->axcy", S, rho)
+        d_AB = self.d_A * self.d_B
+        return qt.Qobj(out.reshape(d_AB, d_AB), dims=state.dims)
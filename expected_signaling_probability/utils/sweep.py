@@ -0,0 +1,228 @@
+from expected_signaling_probability.utils.params import ExtraParams, DEFAULT_EXTRA_PARAMS, ComputeParams, DEFAULT_COMPUTE_PARAMS
+from expected_signaling_probability.utils.math import BOTH_DIRECTIONS, _ESTIMATORS, _draw_seeds, _seed_draws, _split_into_chunks, _process_pool
+from expected_signaling_probability.utils.stats import statistics, Stats, AdaptiveStopping
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.caching import Cache, make_key
+from expected_signaling_probability.utils.manifest import Manifest
+from concurrent.futures import as_completed
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from tqdm import tqdm
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SweepCell:
+    quantity: Quantity
+    d_A: int
+    d_B: int
+    direction: Direction
+    n_samples: int
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS
+
+    def cost(self) -> int:
+        # Relative per-sample cost; dense channels on d_A·d_B dimensional states scale like (d_A·d_B)⁴.
+        if self.extra_params.induced_marginals and self.quantity == Quantity.CORRELATION:
+            return max(self.d_A, self.d_B) ** 3  # eigenvalues of one marginal
+        return (self.d_A * self.d_B) ** 4
+
+    def key(self) -> str:
+        # Same naming as the per-seed cache files, e.g. "S dA=2 dB=3 direction=AtoB superoperator_rank=4".
+        return make_key(self.quantity.value, self.d_A, self.d_B, self.direction, self.extra_params)
+
+
+def run_sweep(
+    cells: list[SweepCell],
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    caches: dict[Quantity, Cache | None] | None = None,
+    manifest: Manifest | None = None,
+) -> Iterator[tuple[SweepCell, Stats]]:
+    # Splits every cell into seed chunks and runs all chunks of the grid on one pool, most expensive
+    # cells first, so the largest dimensions don't end up as a serial tail. Yields as cells complete.
+    # Cells that differ only in direction are evaluated together from one draw per seed, and chunks of different
+    # quantities on the same seeds run as one job, so that they share their draws through ARTIFACTS (utils/artifacts.py).
+    # With adaptive stopping, each group stops on its own; its time budget counts from the start of the sweep.
+    # With a manifest, finished cells are restored from it without touching the cache (when their samples are not
+    # needed); unfinished cells resume from the seeds in the cache. Otherwise such cells come from the
+    # caches' summary index when it is current, and finished cells are indexed.
+    n_workers = compute_params.n_workers or 1
+
+    groups: dict[SweepCell, list[SweepCell]] = {}  # A_TO_B-normalized cell -> cells in BOTH_DIRECTIONS order
+    for cell in sorted(dict.fromkeys(cells), key=lambda cell: BOTH_DIRECTIONS.index(cell.direction)):
+        groups.setdefault(replace(cell, direction=Direction.A_TO_B), []).append(cell)
+
+    def cache_for(quantity: Quantity) -> Cache | None:
+        if caches is None:
+            return _ESTIMATORS[quantity].cache
+        return caches.get(quantity)
+
+    def indexed(cell: SweepCell) -> Stats | None:
+        cache = cache_for(cell.quantity)
+        if compute_params.adaptive or cache is None:
+            return None
+        return cache.indexed_summary(cell.d_A, cell.d_B, cell.direction, cell.extra_params, cell.n_samples)
+
+    if compute_params.sample_retention in (SampleRetention.HISTOGRAM, SampleRetention.NONE):
+        for key, group in list(groups.items()):
+            restored = [manifest.finished(cell.key(), cell.n_samples, compute_params.rtol, compute_params.time_budget) if manifest is not None else None for cell in group]
+            restored = [stats if stats is not None else indexed(cell) for cell, stats in zip(group, restored)]
+            if all(stats is not None for stats in restored):
+                del groups[key]
+                yield from zip(group, restored)  # type: ignore[misc]
+    ordered_groups = sorted(groups.items(), key=lambda item: item[0].cost(), reverse=True)
+
+    seeds: dict[SweepCell, np.typing.NDArray] = {}
+    values: dict[SweepCell, np.typing.NDArray] = {}  # (n_samples, len(directions)) per group
+    missing: dict[SweepCell, np.typing.NDArray] = {}
+    remaining: dict[SweepCell, int] = {}
+    stopping: dict[SweepCell, AdaptiveStopping] = {}
+    available: dict[SweepCell, np.typing.NDArray] = {}
+    jobs: list[tuple[SweepCell, np.typing.NDArray]] = []
+    completed: list[SweepCell] = []
+
+    for key, group in ordered_groups:
+        seeds[key] = np.arange(1, key.n_samples + 1)
+        values[key] = np.empty((key.n_samples, len(group)))
+        missing[key] = np.ones((key.n_samples, len(group)), dtype=bool)
+
+        if (cache := cache_for(key.quantity)) is not None:
+            for j, cell in enumerate(group):
+                values[key][:, j], found = cache.get_many(cell.d_A, cell.d_B, cell.direction, seeds[key], cell.extra_params)
+                missing[key][:, j] = ~found
+
+        available[key] = ~missing[key].any(axis=1)
+        if compute_params.adaptive:
+            stopping[key] = AdaptiveStopping(key.n_samples, len(group), compute_params.rtol, compute_params.time_budget, compute_params.min_samples)
+            if stopping[key].advance(values[key], available[key]) is not None:
+                completed.append(key)
+                continue
+
+        chunks = _split_into_chunks(np.flatnonzero(~available[key]), compute_params)
+        remaining[key] = len(chunks)
+        jobs.extend((key, chunk) for chunk in chunks)
+        if not chunks:
+            completed.append(key)
+
+    def group_stats(key: SweepCell) -> Iterator[tuple[SweepCell, Stats]]:
+        n_used = stopping[key].stop if key in stopping else key.n_samples
+        cache = cache_for(key.quantity)
+        for j, cell in enumerate(groups[key]):
+            stats = statistics(values[key][:n_used, j], compute_params.sample_retention, d_A=cell.d_A, d_B=cell.d_B, direction=cell.direction)
+            if cache is not None and n_used == key.n_samples:
+                # The index keeps histogram summaries; the Stats just computed are one unless the retention differs.
+                summary = stats if compute_params.sample_retention == SampleRetention.HISTOGRAM else statistics(values[key][:, j], SampleRetention.HISTOGRAM, d_A=cell.d_A, d_B=cell.d_B, direction=cell.direction)
+                cache.record_summary(cell.d_A, cell.d_B, cell.direction, cell.extra_params, summary)
+                used_caches.add(cache)  # its index is written when the sweep closes it
+            if manifest is not None:
+                budget_stopped = key in stopping and stopping[key].budget_stopped
+                manifest.record_finished(cell.key(), cell.n_samples, compute_params.rtol, stats, compute_params.time_budget if budget_stopped else None)
+            yield cell, stats
+
+    used_caches: set[Cache] = set()
+
+    def job_args(key: SweepCell, chunk: np.typing.NDArray) -> tuple:
+        directions = [cell.direction for cell in groups[key]]
+        draw, draw_batch = _seed_draws(key.quantity, key.d_A, key.d_B, directions, key.extra_params, compute_params)
+        return draw, draw_batch, seeds[key][chunk], compute_params.batch_size
+
+    bundles: dict[tuple, list[tuple[SweepCell, np.typing.NDArray]]] = {}  # in cost order, like `jobs`
+    for key, chunk in jobs:
+        bundles.setdefault((key.d_A, key.d_B, key.extra_params, tuple(seeds[key][chunk].tolist())), []).append((key, chunk))
+
+    def completed_jobs() -> Iterator[tuple[SweepCell, np.typing.NDArray, np.typing.NDArray]]:
+        if n_workers == 1:
+            for bundle in bundles.values():
+                bundle = [(key, chunk) for key, chunk in bundle if remaining[key] > 0]
+                if bundle:
+                    for (key, chunk), chunk_values in zip(bundle, _draw_seeds_together([job_args(key, chunk) for key, chunk in bundle])):
+                        if remaining[key] > 0:
+                            yield key, chunk, chunk_values
+            return
+
+        # Chunks are queued in cost order, so workers pick up the largest cells first.
+        with _process_pool(n_workers) as pool:
+            futures = {pool.submit(_draw_seeds_together, [job_args(key, chunk) for key, chunk in bundle]): bundle for bundle in bundles.values()}
+            for future in as_completed(futures):
+                for (key, chunk), chunk_values in zip(futures[future], future.result()):
+                    if remaining[key] == 0:
+                        continue
+                    yield key, chunk, chunk_values
+                    if remaining[key] == 0:
+                        # The group stopped early; drop the chunks that have not started yet and only serve stopped groups.
+                        for other, other_bundle in futures.items():
+                            if all(remaining[other_key] == 0 for other_key, _ in other_bundle):
+                                other.cancel()
+
+    total = sum(key.n_samples for key in groups)
+    done = total - sum(len(chunk) for _, chunk in jobs)
+    try:
+        for key in completed:
+            yield from group_stats(key)
+
+        with tqdm(total=total, initial=done, desc=f"Sweep ({len(groups)} jobs, {n_workers=})", leave=False) as progress:
+            for key, chunk, chunk_values in completed_jobs():
+                chunk_values = chunk_values.reshape(len(chunk), len(groups[key]))
+                values[key][chunk] = chunk_values
+                if (cache := cache_for(key.quantity)) is not None:
+                    used_caches.add(cache)
+                    for j, cell in enumerate(groups[key]):
+                        new = missing[key][chunk, j]
+                        for seed, tr_dist in zip(seeds[key][chunk][new].tolist(), chunk_values[new, j].tolist()):
+                            cache.set(cell.d_A, cell.d_B, cell.direction, seed, tr_dist, cell.extra_params)
+                progress.update(len(chunk))
+
+                remaining[key] -= 1
+                available[key][chunk] = True
+                if key in stopping and stopping[key].advance(values[key], available[key]) is not None:
+                    remaining[key] = 0
+                if remaining[key] == 0:
+                    if cache is not None:
+                        cache.flush()
+                    yield from group_stats(key)
+    finally:
+        # Also on an interruption, so that every drawn seed is on disk for the next run.
+        for cache in used_caches:
+            cache.close()
+
+def _draw_seeds_together(job_args: list[tuple]) -> list[np.typing.NDArray]:
+    # _draw_seeds for several jobs on the same seeds (e.g. ⟨S⟩, ⟨T⟩ and ⟨C⟩ of one d_A, d_B), interleaved batch by
+    # batch so that the draws they share are still in ARTIFACTS when the next job needs them.
+    if len(job_args) == 1:
+        return [_draw_seeds(*job_args[0])]
+    _, _, seeds, batch_size = job_args[0]
+    step = batch_size or 1
+    parts: list[list[np.typing.NDArray]] = [[] for _ in job_args]
+    for start in range(0, len(seeds), step):
+        for part, (draw, draw_batch, job_seeds, _) in zip(parts, job_args):
+            part.append(_draw_seeds(draw, draw_batch, job_seeds[start : start + step], batch_size))
+    return [np.concatenate(part) for part in parts]
+
+
+def compute_sweep(
+    cells: list[SweepCell],
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    caches: dict[Quantity, Cache | None] | None = None,
+    manifest: Manifest | None = None,
+) -> list[Stats]:
+    # Stats in the order of `cells`.
+    all_stats = dict(run_sweep(cells, compute_params, caches, manifest))
+    return [all_stats[cell] for cell in cells]
+
+
+def compute_asymmetric_sweep(
+    quantity: Quantity,
+    n_samples: int,
+    d_A_min: int,
+    d_A_max: int,
+    d_B: int,
+    directions: list[Direction],
+    compute_params: ComputeParams = DEFAULT_COMPUTE_PARAMS,
+    extra_params: ExtraParams = DEFAULT_EXTRA_PARAMS,
+) -> dict[Direction, list[Stats]]:
+    assert d_A_min <= d_A_max
+    d_As = list(range(d_A_min, d_A_max + 1))
+    cells = [SweepCell(quantity, d_A, d_B, direction, n_samples, extra_params) for direction in directions for d_A in d_As]
+    all_stats = compute_sweep(cells, compute_params)
+    return {direction: all_stats[i * len(d_As) : (i + 1) * len(d_As)] for i, direction in enumerate(directions)}
@@ -0,0 +1,54 @@
+from expected_signaling_probability.utils.math import generate_random_dm_array, generate_random_kraus_channel
+from expected_signaling_probability.utils.artifacts import ARTIFACTS, ArtifactCache
+from expected_signaling_probability.utils.sweep import SweepCell, compute_sweep
+from expected_signaling_probability.utils.params import ComputeParams, DEFAULT_EXTRA_PARAMS
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.seeding import Component
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def artifacts():
+    ARTIFACTS.clear()
+    ARTIFACTS.hits = ARTIFACTS.misses = 0
+    yield ARTIFACTS
+    ARTIFACTS.resize(ArtifactCache().max_bytes)
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    cache = ArtifactCache(max_bytes=3 * 800)
+    for i in range(3):
+        cache.put((i,), np.zeros(100))
+    assert cache.get((0,)) is not None  # 0 is now the most recently used
+    cache.put((3,), np.zeros(100))
+    assert cache.get((1,)) is None and cache.get((0,)) is not None
+    assert (len(cache), cache.size) == (3, 2400)
+
+    cache.put((4,), np.zeros(1000))  # larger than the whole cache: not stored
+    assert cache.get((4,)) is None and len(cache) == 3
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_draws_are_shared_by_equal_arguments(artifacts):
+    rho = generate_random_dm_array(3, 2, 5)
+    assert generate_random_dm_array(3, 2, seed=5) is rho and not rho.flags.writeable
+    assert generate_random_dm_array(3, 2, 5, DEFAULT_EXTRA_PARAMS, Component.STATE) is rho  # defaults passed explicitly
+    assert generate_random_dm_array(3, 2, 6) is not rho
+    assert generate_random_dm_array(3, 2, 5, component=Component.SECOND_STATE) is not rho
+    assert generate_random_kraus_channel(3, 2, 5) is generate_random_kraus_channel(3, 2, 5)
+    assert generate_random_dm_array(3, 2) is not generate_random_dm_array(3, 2)  # unseeded draws are not stored
+    assert (artifacts.hits, artifacts.misses) == (3, 4)
+
+
+@pytest.mark.parametrize("compute_params", [ComputeParams(), ComputeParams(batch_size=3)])
+def test_sweep_of_all_quantities_draws_shared_objects_once(artifacts, compute_params):
+    cells = [SweepCell(quantity, 3, 2, direction, 6) for quantity in Quantity for direction in Direction]
+    artifacts.resize(0)
+    expected = compute_sweep(cells, compute_params, caches={})
+
+    artifacts.resize(ArtifactCache().max_bytes)
+    shared = compute_sweep(cells, compute_params, caches={})
+    assert all(np.array_equal(a.samples, b.samples) for a, b in zip(shared, expected))
+    assert artifacts.hits > 0 and len(artifacts) > 0
@@ -0,0 +1,26 @@
+from expected_signaling_probability.benchmarks import Timing, compare, dimension_pairs, load_results, run_benchmarks, write_results
+from expected_signaling_probability.cli import main
+
+
+def test_benchmarks_cover_every_phase_and_round_trip(tmp_path):
+    assert dimension_pairs([2, 3, 5], max_dim=10) == [(2, 2), (2, 3), (2, 5), (3, 2), (3, 3), (5, 2)]
+
+    timings = run_benchmarks([(2, 3)], min_time=0)
+    for name in ["cache/get", "cache/set", "fit_power_law n=15", "sample/qutip dA=2 dB=3", "sample/batch dA=2 dB=3", "phase/qutip/ptrace dA=2 dB=3", "phase/kraus/tracedist dA=2 dB=3"]:
+        assert timings[name].repeats >= 3 and 0 < timings[name].min <= timings[name].median
+
+    write_results(tmp_path / "baseline.json", timings)
+    assert load_results(tmp_path / "baseline.json") == timings
+
+
+def test_compare_flags_slowdowns_beyond_the_threshold(tmp_path):
+    baseline = {"a": Timing(1.0, 1.0, 3), "b": Timing(1.0, 1.0, 3), "c": Timing(1.0, 1.0, 3), "only in baseline": Timing(1.0, 1.0, 3)}
+    current = {"a": Timing(1.2, 1.2, 3), "b": Timing(1.5, 1.5, 3), "c": Timing(0.5, 0.5, 3)}
+    regressions, improvements = compare(baseline, current, threshold=0.25)
+    assert [(c.name, c.ratio) for c in regressions] == [("b", 1.5)]
+    assert [c.name for c in improvements] == ["c"]
+
+    write_results(tmp_path / "baseline.json", baseline)
+    write_results(tmp_path / "current.json", current)
+    assert main(["bench", "compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]) == 1
+    assert main(["bench", "compare", str(tmp_path / "baseline.json"), str(tmp_path / "current.json"), "--threshold", "0.6"]) == 0
@@ -0,0 +1,28 @@
+from expected_signaling_probability.utils.bootstrap import bootstrap_means, bootstrap_power_law
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.stats import statistics
+import numpy as np
+
+
+def power_law_cells(retention: SampleRetention, n: int = 400):
+    generator = np.random.default_rng(1)
+    return [statistics(generator.exponential(0.5 * d**-1.5, n), retention, d_A=d, d_B=2, direction=Direction.A_TO_B) for d in range(2, 12)]
+
+
+def test_bootstrap_is_chunk_invariant_and_matches_the_standard_error():
+    samples = [np.random.default_rng(j).random(50 + j) for j in range(3)]
+    means = bootstrap_means(samples, 300, max_bytes=16 * 60 * 7)  # a few replicates per chunk
+    assert np.array_equal(means, bootstrap_means(samples, 300))
+    assert np.allclose(means.std(axis=0), [s.std() / np.sqrt(len(s)) for s in samples], rtol=0.15)
+
+
+def test_bootstrap_power_law_covers_the_exponent():
+    fit = bootstrap_power_law(power_law_cells(SampleRetention.ALL), n_replicates=2000)
+    assert fit.slope_ci[0] < -1.5 < fit.slope_ci[1]
+    assert fit.prefactor_ci[0] < fit.prefactor < fit.prefactor_ci[1]
+    assert 0 < fit.slope_se < 0.1
+
+    # Compact stats resample their histogram, which agrees up to the bin width.
+    compact = bootstrap_power_law(power_law_cells(SampleRetention.HISTOGRAM), n_replicates=2000)
+    assert compact.slope == fit.slope and np.isclose(compact.slope_se, fit.slope_se, rtol=0.2)
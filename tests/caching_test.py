@@ -0,0 +1,113 @@
+from expected_signaling_probability.utils.caching import Cache, RECORD_DTYPE
+from expected_signaling_probability.utils.params import DEFAULT_EXTRA_PARAMS
+from expected_signaling_probability.utils.directions import Direction
+import numpy as np
+
+
+KEY = (2, 3, Direction.A_TO_B)
+
+
+def test_set_get_roundtrip_and_flush(tmp_path):
+    cache = Cache("S", root=tmp_path, flush_every=3)
+    for seed in range(1, 6):
+        cache.set(*KEY, seed, seed / 10, DEFAULT_EXTRA_PARAMS)
+
+    cache_file = tmp_path / "S" / "S dA=2 dB=3 direction=AtoB.bin"
+    assert len(np.fromfile(cache_file, dtype=RECORD_DTYPE)) == 3  # only the first full batch is on disk
+    assert cache.get(*KEY, 5, DEFAULT_EXTRA_PARAMS) == 0.5  # pending records are still visible
+
+    cache.close()
+    cache.wait()
+    assert len(np.fromfile(cache_file, dtype=RECORD_DTYPE)) == 5
+    assert cache.get(*KEY, 6, DEFAULT_EXTRA_PARAMS) is None
+
+
+def test_compaction_deduplicates_and_sorts(tmp_path):
+    cache = Cache("S", root=tmp_path)
+    for seed, value in [(3, 0.3), (1, 0.1), (3, 0.33), (2, 0.2)]:
+        cache.set(*KEY, seed, value, DEFAULT_EXTRA_PARAMS)
+    cache.close()
+    cache.wait()
+
+    records = np.fromfile(tmp_path / "S" / "S dA=2 dB=3 direction=AtoB.bin", dtype=RECORD_DTYPE)
+    assert records["seed"].tolist() == [1, 2, 3]
+    assert records["value"].tolist() == [0.1, 0.2, 0.33]
+
+
+def test_legacy_csv_is_imported(tmp_path):
+    (tmp_path / "T").mkdir()
+    (tmp_path / "T" / "T dA=2 dB=3 direction=AtoB.csv").write_text("seed,value\n1.0,0.25\n2.0,0.5\n")
+    cache = Cache("T", root=tmp_path)
+
+    cache.warm(*KEY, DEFAULT_EXTRA_PARAMS)
+    assert cache.get(*KEY, 2, DEFAULT_EXTRA_PARAMS) == 0.5
+    cache.close()
+    assert (tmp_path / "T" / "T dA=2 dB=3 direction=AtoB.bin").exists()
+    assert cache.import_csv_files() == 0
+
+
+def test_zero_values_hit_and_empty_warm_key_stays_in_memory(tmp_path, monkeypatch):
+    cache = Cache("S", root=tmp_path)
+    cache.warm(*KEY, DEFAULT_EXTRA_PARAMS)
+    # The key has no file yet; lookups must not go back to disk.
+    monkeypatch.setattr(cache, "_read_records", lambda *_: (_ for _ in ()).throw(AssertionError("disk read")))
+
+    assert cache.get(*KEY, 1, DEFAULT_EXTRA_PARAMS) is None
+    cache.set(*KEY, 1, 0.0, DEFAULT_EXTRA_PARAMS)
+    assert cache.get(*KEY, 1, DEFAULT_EXTRA_PARAMS) == 0.0
+    assert (cache.hits, cache.misses) == (1, 1)
+    monkeypatch.undo()
+    cache.close()
+
+
+def test_one_shot_reuses_cached_zero(tmp_path):
+    from expected_signaling_probability.utils.math import _one_shot_signaling_probability
+
+    cache = Cache("S", root=tmp_path)
+    cache.set(2, 2, Direction.A_TO_B, 1, 0.0, DEFAULT_EXTRA_PARAMS)
+    assert _one_shot_signaling_probability(2, 2, Direction.A_TO_B, 1, cache) == 0.0
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_summary_index_survives_appends_and_compaction(tmp_path, monkeypatch):
+    cache = Cache("S", root=tmp_path)
+    for seed in range(1, 5):
+        cache.set(*KEY, seed, seed / 10, DEFAULT_EXTRA_PARAMS)
+    assert cache.indexed_summary(*KEY, DEFAULT_EXTRA_PARAMS, 4) is None
+    assert cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 5) is None  # seed 5 is not cached
+    assert np.isclose(cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 4).mean, 0.25)
+
+    # Later seeds and compaction leave the summary of seeds 1..4 current, read without touching the records.
+    cache.set(*KEY, 6, 0.6, DEFAULT_EXTRA_PARAMS)
+    cache.set(*KEY, 6, 0.7, DEFAULT_EXTRA_PARAMS)
+    cache.close()
+    cache.wait()
+    cache = Cache("S", root=tmp_path)
+    monkeypatch.setattr(cache, "_read_records", lambda *_: (_ for _ in ()).throw(AssertionError("disk read")))
+    stats = cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 4)
+    assert (stats.n, stats.min, stats.max, len(stats.samples)) == (4, 0.1, 0.4, 0)
+    monkeypatch.undo()
+
+    # Rewriting a covered seed invalidates it.
+    cache.set(*KEY, 2, 0.6, DEFAULT_EXTRA_PARAMS)
+    assert cache.indexed_summary(*KEY, DEFAULT_EXTRA_PARAMS, 4) is None
+    assert np.isclose(cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 4).mean, 0.35)
+
+
+def test_compaction_drops_summaries_that_later_records_invalidated(tmp_path):
+    cache = Cache("S", root=tmp_path)
+    for seed in range(1, 4):
+        cache.set(*KEY, seed, seed / 10, DEFAULT_EXTRA_PARAMS)
+    cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 3)
+    cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 1)
+    # Seed 2 is rewritten after the summaries, then later seeds are appended: the file is [1, 2, 3, 2, 4, 5].
+    for seed, value in [(2, 0.6), (4, 0.4), (5, 0.5)]:
+        cache.set(*KEY, seed, value, DEFAULT_EXTRA_PARAMS)
+    cache.close()
+    cache.wait()
+
+    # Compacted to [1, 2, 3, 4, 5]: the records past the old size of the summary of seeds 1..3 are 4 and 5 only.
+    cache = Cache("S", root=tmp_path)
+    assert cache.indexed_summary(*KEY, DEFAULT_EXTRA_PARAMS, 3) is None
+    assert cache.indexed_summary(*KEY, DEFAULT_EXTRA_PARAMS, 1).mean == 0.1
+    assert np.isclose(cache.summary(*KEY, DEFAULT_EXTRA_PARAMS, 3).mean, 1 / 3)
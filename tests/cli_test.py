@@ -0,0 +1,52 @@
+from expected_signaling_probability.cli import main
+from expected_signaling_probability.utils.spec import SweepSpec, Geometry, load_spec, load_summary
+from expected_signaling_probability.utils.sweep import compute_sweep
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.params import ComputeParams
+from pathlib import Path
+import matplotlib
+import numpy as np
+import json
+
+matplotlib.use("Agg")
+
+
+SPEC = {
+    "quantity": "T",
+    "geometry": "asymmetric",
+    "d_min": 2,
+    "d_max": 3,
+    "d_B": 2,
+    "directions": ["AtoB", "BtoA"],
+    "n_samples": 5,
+    "rank": 2,
+    "engine": "kraus",
+    "n_workers": 1,
+}
+
+
+def test_run_writes_summary_matching_the_sweep(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "spec.json").write_text(json.dumps(SPEC))
+
+    assert main(["run", "spec.json"]) == 0
+    spec, all_stats = load_summary(Path("results/spec.json"))
+    assert spec == load_spec(tmp_path / "spec.json")
+
+    expected = compute_sweep(spec.cells(), ComputeParams(batch_size=5), caches={})
+    assert [(s.d_A, s.direction) for s in all_stats] == [(s.d_A, s.direction) for s in expected]
+    assert np.allclose([s.mean for s in all_stats], [s.mean for s in expected])
+    assert all(s.histogram[0].sum() == 5 for s in all_stats)
+
+    assert main(["plot", "results/spec.json", "--no-save"]) == 0
+
+
+def test_toml_spec_and_defaults(tmp_path):
+    (tmp_path / "spec.toml").write_text('quantity = "S"\nd_min = 2\nd_max = 4\nn_samples = 10\n')
+    spec = load_spec(tmp_path / "spec.toml")
+
+    assert spec.geometry == Geometry.SYMMETRIC
+    assert [(cell.d_A, cell.d_B) for cell in spec.cells()] == [(2, 2), (3, 3), (4, 4)]
+    assert all(cell.quantity == Quantity.SIGNALING and cell.direction == Direction.A_TO_B for cell in spec.cells())
+    assert SweepSpec.from_dict(spec.to_dict()) == spec
@@ -0,0 +1,57 @@
+from expected_signaling_probability.utils.math import generate_random_dm, generate_random_superoperator, generate_random_local_channel, expected_signaling_probability
+from expected_signaling_probability.utils.data_layers import DataLayer, density, load_table, write_table, use_table, table_key
+from expected_signaling_probability.utils.params import ExtraParams
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.superoperators import LocalSuperoperator
+from expected_signaling_probability.benchmarks import autotune_data_layers
+from dataclasses import replace
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def table():
+    # An empty table for the test, so that a table in data/ does not change the defaults.
+    use_table({})
+    yield
+    use_table(None)
+
+
+def test_operators_are_stored_in_the_layer_of_their_density(table):
+    superoperator = generate_random_superoperator(3, 2, 1)
+    assert density(superoperator) == 1
+    assert superoperator.dtype.__name__ == DataLayer.DENSE.value
+    assert generate_random_superoperator(3, 2, 1, ExtraParams(global_channel_rank=2)).dtype.__name__ == DataLayer.DENSE.value
+
+    rho = generate_random_dm(3, 2, 1)
+    for direction in Direction:
+        local_operation = generate_random_local_channel(3, 2, direction, 1)
+        assert local_operation.data_layer == DataLayer.DENSE
+        tensored = local_operation.tensored()
+        assert density(tensored) <= 1 / (2 if direction == Direction.A_TO_B else 3) ** 2
+        csr_operation = replace(local_operation, data_layer=DataLayer.CSR)
+        assert np.allclose(csr_operation(rho).full(), local_operation(rho).full(), atol=1e-14)
+
+
+def test_csr_local_operation_builds_its_super_tensor_once(table, monkeypatch):
+    builds = []
+    tensored = LocalSuperoperator.tensored
+    monkeypatch.setattr(LocalSuperoperator, "tensored", lambda self: builds.append(1) or tensored(self))
+    rho = generate_random_dm(3, 2, 1)
+    local_operation = replace(generate_random_local_channel(3, 2, Direction.A_TO_B, 1), data_layer=DataLayer.CSR)
+    first = local_operation(rho)
+    assert np.allclose(local_operation(rho).full(), first.full(), atol=1e-14)
+    assert len(builds) == 1
+
+
+def test_autotuned_table_overrides_the_defaults(table, tmp_path):
+    expected = expected_signaling_probability(4, 2, 2, Direction.A_TO_B, cache=None)
+    tuned = autotune_data_layers([(2, 2)], min_time=0.01)
+    assert set(tuned) == {table_key(role, 2, 2) for role in ("global", "local_A", "local_B")}
+
+    path = tmp_path / "data_layers.json"
+    write_table({key: DataLayer.CSR for key in tuned}, path)
+    use_table(load_table(path))
+    assert generate_random_superoperator(2, 2, 1).dtype.__name__ == DataLayer.CSR.value
+    assert generate_random_local_channel(2, 2, Direction.A_TO_B, 1).data_layer == DataLayer.CSR
+    assert np.allclose(expected_signaling_probability(4, 2, 2, Direction.A_TO_B, cache=None), expected, atol=1e-14)
@@ -0,0 +1,31 @@
+from expected_signaling_probability.utils.fitting import fit_power_law, fit_power_laws
+from scipy import stats as sp_stats
+import numpy as np
+
+
+X = np.arange(2.0, 17.0)
+
+
+def test_unweighted_fit_matches_linregress():
+    y = 0.3 * X**-1.5 * np.exp(np.random.default_rng(3).normal(0, 0.05, len(X)))
+    fit = fit_power_law(X, y)
+    lin = sp_stats.linregress(np.log10(X), np.log10(y))
+    assert np.allclose([fit.slope, fit.intercept, fit.stderr, fit.r2, fit.pval], [lin.slope, lin.intercept, lin.stderr, lin.rvalue**2, lin.pvalue])
+
+
+def test_batched_weighted_and_finite_size_fits():
+    y = 0.3 * X**-1.5 * np.exp(np.random.default_rng(4).normal(0, 0.05, (2, 3, len(X))))
+    fits = fit_power_laws(X, y)
+    assert fits.slope.shape == (2, 3)
+    assert np.isclose(fits.slope[1, 2], fit_power_law(X, y[1, 2]).slope)
+
+    # A point with a large standard error barely pulls the weighted fit.
+    outlier = 0.3 * X**-1.5
+    outlier[0] *= 3
+    sem = np.full(len(X), 1e-4)
+    sem[0] = 10.0
+    assert np.isclose(fit_power_law(X, outlier, sem).slope, -1.5, atol=1e-3)
+    assert not np.isclose(fit_power_law(X, outlier).slope, -1.5, atol=1e-2)
+
+    corrected = fit_power_law(X, 0.3 * X**-1.5 * np.exp(0.8 / X), finite_size=True)
+    assert np.allclose([corrected.slope, corrected.correction, corrected.prefactor], [-1.5, 0.8, 0.3])
@@ -0,0 +1,32 @@
+import subprocess
+import json
+import sys
+
+
+IMPORT_BUDGET_SECONDS = 1.0  # qutip alone takes longer than this
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import expected_signaling_probability
+from expected_signaling_probability.utils.math import expected_signaling_probability
+from expected_signaling_probability.utils.sweep import run_sweep
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": [m for m in ("qutip", "scipy", "pandas") if m in sys.modules and not type(sys.modules[m]).__name__ == "_LazyModule"]}))
+"""
+
+
+def test_import_is_lazy_and_within_budget(tmp_path):
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=tmp_path, capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout)
+
+    assert report["modules"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_SECONDS
+    assert not (tmp_path / "data").exists()  # no cache directories are created at import
+
+
+def test_lazy_attributes_resolve():
+    import expected_signaling_probability as package
+
+    assert callable(package.expected_signaling_probability)
+    assert "expected_signaling_probability" in dir(package)
@@ -1,4 +1,12 @@
+from expected_signaling_probability.utils.math import (
+    generate_random_dm,
+    generate_random_local_superoperator,
+    generate_random_local_channel,
+    generate_random_local_kraus_channel,
+)
+from expected_signaling_probability.utils.directions import Direction
 import qutip as qt
+import numpy as np
 import pytest
 
 
@@ -28,3 +36,16 @@ def test_superoperator_supertensor_identity(dims):
 
     difference = rho_B_original - rho_B_after_super_A
     assert difference.norm(norm="tr") < 1e-10
+
+
+def test_local_channel_matches_supertensor(dims):
+    _, d_A, d_B = dims
+    rho_AB = generate_random_dm(d_A, d_B, seed=3)
+    for direction in Direction:
+        super_local = generate_random_local_superoperator(d_A, d_B, direction, seed=5)
+        local_channel = generate_random_local_channel(d_A, d_B, direction, seed=5)
+        local_kraus_channel = generate_random_local_kraus_channel(d_A, d_B, direction, seed=5)
+
+        expected = super_local(rho_AB).full()
+        assert np.allclose(local_channel(rho_AB).full(), expected, atol=1e-12)
+        assert np.allclose(local_kraus_channel(rho_AB.full()), expected, atol=1e-12)
@@ -0,0 +1,33 @@
+from expected_signaling_probability.utils.math import expected_signaling_probability
+from expected_signaling_probability.utils.instrumentation import recording, enabled
+from expected_signaling_probability.utils.params import ComputeParams
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.caching import Cache
+from expected_signaling_probability.utils.artifacts import ARTIFACTS
+import pstats
+import json
+
+
+def test_report_and_profile_cover_phases_and_cache_io(tmp_path):
+    ARTIFACTS.clear()  # every draw is made, and timed, once
+    compute_params = ComputeParams(report=tmp_path / "report.json", profile=tmp_path / "run.pstats")
+    expected_signaling_probability(4, 2, 3, Direction.A_TO_B, Cache("S", root=tmp_path), compute_params=compute_params)
+    assert not enabled()
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    for phase in ["state_draw", "local_op_draw", "channel_draw", "local_op", "channel_application", "ptrace", "tracedist", "cache/get", "cache/set"]:
+        assert report["phases"][phase]["calls"] == 4
+    assert report["counters"] == {"cache_misses": 4, "cache_bytes_written": 4 * 16, "artifact_misses": 3 * 4}
+    assert report["throughput"]["expected_signaling_probability dA=2 dB=3"]["samples"] == 4
+    assert pstats.Stats(str(tmp_path / "run.pstats")).total_calls > 0
+
+
+def test_nested_runs_add_up_in_the_enclosing_recording(tmp_path):
+    cache = Cache("S", root=tmp_path)
+    with recording() as outer:
+        expected_signaling_probability(3, 2, 2, Direction.B_TO_A, cache, compute_params=ComputeParams(batch_size=3))
+        expected_signaling_probability(3, 2, 2, Direction.B_TO_A, cache, compute_params=ComputeParams(batch_size=3, report=tmp_path / "inner.json"))
+
+    assert outer.counters["cache_misses"] == 3 and outer.counters["cache_hits"] == 3
+    assert outer.throughput["expected_signaling_probability dA=2 dB=2"][0] == 6
+    assert json.loads((tmp_path / "inner.json").read_text())["counters"]["cache_hits"] == 3
@@ -0,0 +1,147 @@
+from expected_signaling_probability.utils.math import (
+    generate_random_dm,
+    generate_random_dm_array,
+    generate_random_superoperator,
+    generate_random_kraus_channel,
+    generate_random_local_superoperator,
+    generate_random_local_kraus_channel,
+    expected_signaling_probability,
+    expected_signaling_probability_both_directions,
+    expected_transmission_probability,
+    expected_correlation_probability,
+    expected_signaling_probability_over_ranks,
+)
+from expected_signaling_probability.utils.kraus import rand_dm_ginibre_batch, rand_dm_induced_batch, tracedist
+from expected_signaling_probability.utils.caching import Cache
+from expected_signaling_probability.utils.params import ExtraParams, ComputeParams
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.engines import Engine
+from expected_signaling_probability.utils.seeding import Seeding, Component
+import scipy.stats
+import qutip as qt
+import numpy as np
+import pytest
+
+
+@pytest.fixture(params=[(2, 2, None), (2, 3, None), (3, 2, 2), (4, 3, 5)])
+def dims_rank(request):
+    return request.param
+
+
+def test_kraus_channels_match_qutip_superoperators(dims_rank):
+    d_A, d_B, rank = dims_rank
+    extra_params = ExtraParams(superoperator_rank=rank)
+    seed = 11
+
+    rho = generate_random_dm(d_A, d_B, seed)
+    assert np.allclose(generate_random_dm_array(d_A, d_B, seed), rho.full(), atol=1e-14)
+
+    global_superoperator = generate_random_superoperator(d_A, d_B, seed, extra_params)
+    global_channel = generate_random_kraus_channel(d_A, d_B, seed, extra_params)
+    assert np.allclose(global_channel(rho.full()), global_superoperator(rho).full(), atol=1e-12)
+
+    for direction in Direction:
+        local_superoperator = generate_random_local_superoperator(d_A, d_B, direction, seed, extra_params)
+        local_channel = generate_random_local_kraus_channel(d_A, d_B, direction, seed, extra_params)
+        assert np.allclose(local_channel(rho.full()), local_superoperator(rho).full(), atol=1e-12)
+
+
+def test_kraus_engine_matches_qutip_engine(dims_rank):
+    d_A, d_B, rank = dims_rank
+    extra_params = ExtraParams(superoperator_rank=rank)
+    for direction in Direction:
+        qutip_samples = expected_signaling_probability(4, d_A, d_B, direction, cache=None, extra_params=extra_params)
+        kraus_samples = expected_signaling_probability(4, d_A, d_B, direction, cache=None, extra_params=extra_params, compute_params=ComputeParams(engine=Engine.KRAUS))
+        assert np.allclose(kraus_samples, qutip_samples, atol=1e-12)
+
+
+@pytest.mark.parametrize("estimator", [expected_signaling_probability, expected_transmission_probability, expected_correlation_probability])
+def test_batched_mode_matches_scalar_path(estimator, dims_rank, tmp_path):
+    d_A, d_B, rank = dims_rank
+    extra_params = ExtraParams(superoperator_rank=rank)
+    scalar_samples = estimator(7, d_A, d_B, Direction.B_TO_A, cache=None, extra_params=extra_params)
+
+    # Seed a partially filled cache so batches mix cached and freshly drawn seeds.
+    cache = Cache("X", root=tmp_path)
+    estimator(3, d_A, d_B, Direction.B_TO_A, cache=cache, extra_params=extra_params)
+    batched_samples = estimator(7, d_A, d_B, Direction.B_TO_A, cache=cache, extra_params=extra_params, compute_params=ComputeParams(batch_size=2))
+    assert np.allclose(batched_samples, scalar_samples, atol=1e-12)
+
+
+@pytest.mark.parametrize("compute_params", [ComputeParams(), ComputeParams(engine=Engine.KRAUS), ComputeParams(batch_size=3)])
+def test_both_directions_match_separate_estimates(dims_rank, compute_params, tmp_path):
+    d_A, d_B, rank = dims_rank
+    extra_params = ExtraParams(superoperator_rank=rank)
+    cache = Cache("X", root=tmp_path)
+    joint = expected_signaling_probability_both_directions(5, d_A, d_B, cache=cache, extra_params=extra_params, compute_params=compute_params)
+    for direction in Direction:
+        separate = expected_signaling_probability(5, d_A, d_B, direction, cache=None, extra_params=extra_params)
+        assert np.allclose(joint[direction], separate, atol=1e-12)
+        # Both cache entries are written.
+        assert np.array_equal(expected_signaling_probability(5, d_A, d_B, direction, cache=cache, extra_params=extra_params), joint[direction])
+
+
+def test_tracedist_closed_forms_match_qutip():
+    for d in (2, 3, 5):
+        rhos = rand_dm_ginibre_batch(d, np.arange(1, 9))
+        sigmas = rand_dm_ginibre_batch(d, np.arange(11, 19))
+        expected = [qt.tracedist(qt.Qobj(rho), qt.Qobj(sigma)) for rho, sigma in zip(rhos, sigmas)]
+        assert np.allclose(tracedist(rhos, sigmas), expected, atol=1e-12)
+        assert np.isclose(tracedist(rhos[0], sigmas[0]), expected[0], atol=1e-12)
+        assert np.allclose(tracedist(rhos, rhos), 0)
+
+
+def test_stream_seeding_is_reproducible_across_engines_and_batches(tmp_path):
+    streams = ExtraParams(superoperator_rank=3, seeding=Seeding.STREAMS)
+    qutip_values = expected_transmission_probability(6, 2, 3, Direction.A_TO_B, cache=None, extra_params=streams)
+    batched = expected_transmission_probability(6, 2, 3, Direction.A_TO_B, cache=None, extra_params=streams, compute_params=ComputeParams(batch_size=4))
+    assert np.allclose(qutip_values, batched)
+
+    signaling = expected_signaling_probability(6, 3, 2, Direction.B_TO_A, cache=None, extra_params=streams)
+    signaling_batched = expected_signaling_probability(6, 3, 2, Direction.B_TO_A, cache=None, extra_params=streams, compute_params=ComputeParams(batch_size=4))
+    assert np.allclose(signaling, signaling_batched)
+    assert not np.allclose(signaling, expected_signaling_probability(6, 3, 2, Direction.B_TO_A, cache=None, extra_params=ExtraParams(superoperator_rank=3)))
+
+    # The second state of a sample no longer coincides with the first state of the next one.
+    assert not np.allclose(generate_random_dm_array(2, 2, 1, streams, Component.SECOND_STATE), generate_random_dm_array(2, 2, 2, streams))
+    assert np.array_equal(generate_random_dm_array(2, 2, 1, ExtraParams(), Component.SECOND_STATE), generate_random_dm_array(2, 2, 2))
+
+    cache = Cache("S", root=tmp_path)
+    expected_signaling_probability(2, 2, 2, Direction.A_TO_B, cache=cache, extra_params=streams)
+    assert (tmp_path / "S" / "S dA=2 dB=2 direction=AtoB superoperator_rank=3 seeding=streams.bin").exists()
+
+
+def test_rank_sweep_matches_per_rank_estimates(tmp_path):
+    cache = Cache("S", root=tmp_path)
+    over_ranks = expected_signaling_probability_over_ranks(5, 2, 3, Direction.B_TO_A, [1, 4, 36], cache=cache, compute_params=ComputeParams(batch_size=3))
+    for rank, tr_dists in over_ranks.items():
+        extra_params = ExtraParams(global_channel_rank=rank)
+        assert np.allclose(tr_dists, expected_signaling_probability(5, 2, 3, Direction.B_TO_A, cache=None, extra_params=extra_params))
+        assert np.allclose(tr_dists, expected_signaling_probability(5, 2, 3, Direction.B_TO_A, cache=None, extra_params=extra_params, compute_params=ComputeParams(engine=Engine.KRAUS)))
+        assert (tmp_path / "S" / f"S dA=2 dB=3 direction=BtoA global_channel_rank={rank}.bin").exists()
+
+    # The full rank is the default channel, and rerunning reads every rank back from the cache.
+    assert np.allclose(over_ranks[36], expected_signaling_probability(5, 2, 3, Direction.B_TO_A, cache=None))
+    cache.reset_counters()
+    expected_signaling_probability_over_ranks(5, 2, 3, Direction.B_TO_A, [1, 4, 36], cache=cache)
+    assert (cache.hits, cache.misses) == (15, 0)
+
+
+def test_induced_marginals_match_partial_traces(tmp_path):
+    # E Tr ρ² = (d + K) / (d K + 1) under the induced measure.
+    for d, K in [(2, 2), (3, 12), (5, 5)]:
+        purities = np.einsum("nij,nji->n", *2 * [rand_dm_induced_batch(d, K, np.arange(1, 4001))]).real
+        assert abs(purities.mean() - (d + K) / (d * K + 1)) < 4 * purities.std() / np.sqrt(len(purities))
+
+    induced = ExtraParams(induced_marginals=True)
+    for d_A, d_B in [(2, 2), (3, 2)]:
+        for direction in Direction:
+            traced = expected_correlation_probability(2000, d_A, d_B, direction, cache=None, compute_params=ComputeParams(batch_size=500))
+            direct = expected_correlation_probability(2000, d_A, d_B, direction, cache=None, extra_params=induced, compute_params=ComputeParams(batch_size=500))
+            assert scipy.stats.ks_2samp(traced, direct).pvalue > 0.01
+
+    # Scalar, batched and both-directions draws agree seed by seed, under their own cache key.
+    cache = Cache("C", root=tmp_path)
+    scalar = expected_correlation_probability(6, 4, 3, Direction.B_TO_A, cache=cache, extra_params=induced)
+    assert np.allclose(scalar, expected_correlation_probability(6, 4, 3, Direction.B_TO_A, cache=None, extra_params=induced, compute_params=ComputeParams(batch_size=4)))
+    assert (tmp_path / "C" / "C dA=4 dB=3 direction=BtoA induced_marginals=True.bin").exists()
@@ -0,0 +1,21 @@
+from expected_signaling_probability.utils.math import expected_signaling_probability, expected_correlation_probability
+from expected_signaling_probability.utils.params import ComputeParams, DEFAULT_EXTRA_PARAMS
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.caching import Cache
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("estimator", [expected_signaling_probability, expected_correlation_probability])
+@pytest.mark.parametrize("batch_size", [None, 4])
+def test_results_do_not_depend_on_worker_count(estimator, batch_size, tmp_path):
+    serial_samples = estimator(20, 3, 2, Direction.A_TO_B, cache=None, compute_params=ComputeParams(batch_size=batch_size))
+
+    cache = Cache("X", root=tmp_path)
+    for n_workers in [2, 3]:
+        parallel_samples = estimator(20, 3, 2, Direction.A_TO_B, cache=cache, compute_params=ComputeParams(batch_size=batch_size, n_workers=n_workers))
+        assert np.array_equal(parallel_samples, serial_samples)
+
+    cache.warm(3, 2, Direction.A_TO_B, DEFAULT_EXTRA_PARAMS)
+    assert cache.get(3, 2, Direction.A_TO_B, 20, DEFAULT_EXTRA_PARAMS) == serial_samples[-1]
+    cache.close()
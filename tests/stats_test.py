@@ -0,0 +1,82 @@
+from expected_signaling_probability.utils.stats import StreamingStats, statistics, ADAPTIVE_CHECK_EVERY
+from expected_signaling_probability.utils.math import expected_signaling_probability
+from expected_signaling_probability.utils.sweep import SweepCell, compute_sweep
+from expected_signaling_probability.utils.params import ComputeParams, ExtraParams
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+import numpy as np
+import pytest
+
+
+def test_streaming_stats_match_statistics():
+    samples = np.random.default_rng(0).uniform(size=5000)
+    streaming = StreamingStats()
+    for chunk in np.array_split(samples, 7):
+        streaming.update(chunk)
+    key = dict(d_A=2, d_B=2, direction=Direction.A_TO_B)
+    exact = statistics(samples, **key)
+    approx = streaming.to_stats(**key)
+
+    assert streaming.n == exact.n
+    assert np.isclose(streaming.mean, exact.mean) and np.isclose(streaming.var, exact.var)
+    assert streaming.min == exact.min and streaming.max == exact.max
+    assert abs(approx.median - exact.median) < 0.02 and abs(approx.q25 - exact.q25) < 0.02
+
+    moments_only = StreamingStats(quantiles=False)
+    for chunk in np.array_split(samples, 7):
+        moments_only.update(chunk)
+    assert (moments_only.mean, moments_only.sem) == (streaming.mean, streaming.sem)
+    assert np.isnan(moments_only.to_stats(**key).median)
+
+
+def test_adaptive_stopping_uses_a_seed_prefix():
+    full = expected_signaling_probability(400, 2, 2, Direction.A_TO_B, cache=None, compute_params=ComputeParams(batch_size=20))
+    adaptive = expected_signaling_probability(400, 2, 2, Direction.A_TO_B, cache=None, compute_params=ComputeParams(rtol=0.05, min_samples=50))
+
+    assert 50 <= len(adaptive) < 400 and len(adaptive) % ADAPTIVE_CHECK_EVERY == 0
+    assert np.allclose(adaptive, full[: len(adaptive)])
+    n_before = len(adaptive) - ADAPTIVE_CHECK_EVERY
+    assert n_before < 50 or np.std(full[:n_before], ddof=1) / np.sqrt(n_before) > 0.05 * np.mean(full[:n_before])
+
+    # The sweep scheduler stops at the same seed.
+    cell = SweepCell(Quantity.SIGNALING, 2, 2, Direction.A_TO_B, 400, ExtraParams())
+    (stats,) = compute_sweep([cell], ComputeParams(batch_size=7, rtol=0.05, min_samples=50), caches={})
+    assert stats.n == len(adaptive)
+
+
+def test_time_budget_keeps_min_samples():
+    full = expected_signaling_probability(200, 2, 2, Direction.A_TO_B, cache=None, compute_params=ComputeParams(batch_size=10))
+    budgeted = expected_signaling_probability(200, 2, 2, Direction.A_TO_B, cache=None, compute_params=ComputeParams(time_budget=0.0, batch_size=10, min_samples=30))
+    assert 30 <= len(budgeted) < 200 and np.allclose(budgeted, full[: len(budgeted)])
+    assert statistics(budgeted, d_A=2, d_B=2, direction=Direction.A_TO_B).n == len(budgeted)
+
+    with pytest.raises(ValueError):
+        ComputeParams(time_budget=-1.0)
+    with pytest.raises(ValueError):
+        ComputeParams(min_samples=0)
+
+
+def test_compact_stats_keep_summary_and_plot():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from expected_signaling_probability.utils.plotting import plot_error_bars
+    from expected_signaling_probability.utils.retention import SampleRetention
+    from expected_signaling_probability.utils.fitting import fit_power_law
+
+    cells = [SweepCell(Quantity.SIGNALING, d, d, Direction.A_TO_B, 40) for d in (2, 3)]
+    full = compute_sweep(cells, ComputeParams(batch_size=20), caches={})
+    compact = compute_sweep(cells, ComputeParams(batch_size=20, sample_retention=SampleRetention.HISTOGRAM), caches={})
+
+    for a, b in zip(full, compact):
+        assert (a.mean, a.median, a.q25, a.q75, a.n) == (b.mean, b.median, b.q25, b.q75, b.n)
+        assert b.samples.size == 0 and b.histogram[0].sum() == b.n
+
+    x = np.array([s.d_A for s in compact])
+    y = np.array([s.mean for s in compact])
+    plot_error_bars(x, y, compact)
+    assert np.isfinite(fit_power_law(x, y).slope)
+
+    samples = np.arange(5000.0)
+    reservoir = statistics(samples, SampleRetention.RESERVOIR, d_A=2, d_B=2, direction=Direction.A_TO_B)
+    assert len(reservoir.samples) == 1024 and np.all(np.diff(reservoir.samples) > 0)
@@ -0,0 +1,112 @@
+from expected_signaling_probability.utils.math import expected_signaling_probability, expected_transmission_probability
+from expected_signaling_probability.utils.sweep import SweepCell, run_sweep, compute_sweep
+from expected_signaling_probability.utils.params import ExtraParams, ComputeParams
+from expected_signaling_probability.utils.quantities import Quantity
+from expected_signaling_probability.utils.directions import Direction
+from expected_signaling_probability.utils.retention import SampleRetention
+from expected_signaling_probability.utils.manifest import Manifest
+from expected_signaling_probability.utils.caching import Cache
+from dataclasses import replace
+import numpy as np
+import pytest
+
+
+CELLS = [
+    SweepCell(Quantity.SIGNALING, 2, 2, Direction.A_TO_B, 6),
+    SweepCell(Quantity.SIGNALING, 3, 2, Direction.B_TO_A, 6),
+    SweepCell(Quantity.TRANSMISSION, 4, 2, Direction.A_TO_B, 5),
+]
+
+
+def test_sweep_matches_estimators_and_streams_largest_first(tmp_path):
+    caches = {Quantity.SIGNALING: Cache("S", root=tmp_path), Quantity.TRANSMISSION: Cache("T", root=tmp_path)}
+    streamed = list(run_sweep(CELLS, ComputeParams(batch_size=4), caches))
+    assert [cell for cell, _ in streamed] == [CELLS[2], CELLS[1], CELLS[0]]
+
+    all_stats = dict(streamed)
+    assert np.allclose(all_stats[CELLS[0]].samples, expected_signaling_probability(6, 2, 2, Direction.A_TO_B, cache=None))
+    assert np.allclose(all_stats[CELLS[2]].samples, expected_transmission_probability(5, 4, 2, Direction.A_TO_B, cache=None))
+
+    # Everything is cached now, and a parallel rerun returns the same values in the order of `cells`.
+    rerun = compute_sweep(CELLS, ComputeParams(n_workers=2), caches)
+    assert all(np.array_equal(s.samples, all_stats[cell].samples) for s, cell in zip(rerun, CELLS))
+
+
+def test_parallel_sweep_is_deterministic():
+    serial = compute_sweep(CELLS, caches={})
+    parallel = compute_sweep(CELLS, ComputeParams(n_workers=3), caches={})
+    assert all(np.array_equal(a.samples, b.samples) for a, b in zip(serial, parallel))
+
+
+def test_both_directions_share_one_job():
+    cells = [SweepCell(quantity, 3, 2, direction, 4) for quantity in Quantity for direction in Direction]
+    cells += [SweepCell(Quantity.CORRELATION, 3, 2, direction, 4, ExtraParams(induced_marginals=True)) for direction in Direction]
+    joint = compute_sweep(cells, ComputeParams(batch_size=2), caches={})
+    separate = [compute_sweep([cell], caches={})[0] for cell in cells]
+    assert all(np.allclose(a.samples, b.samples, atol=1e-12) for a, b in zip(joint, separate))
+
+
+def test_manifest_resumes_interrupted_sweep(tmp_path, monkeypatch):
+    import expected_signaling_probability.utils.sweep as sweep
+
+    cells = [SweepCell(Quantity.SIGNALING, 3, 2, Direction.A_TO_B, 20), SweepCell(Quantity.SIGNALING, 2, 2, Direction.A_TO_B, 20)]
+    params = ComputeParams(batch_size=5, sample_retention=SampleRetention.HISTOGRAM)
+    expected = compute_sweep(cells, params, caches={})
+
+    # Kill the sweep after six of the eight chunks: the (3, 2) cell is finished, (2, 2) is at seed 10.
+    draw_seeds, calls = sweep._draw_seeds, []
+
+    def interrupted_draw_seeds(*args):
+        calls.append(len(args[2]))
+        if len(calls) > 6:
+            raise KeyboardInterrupt
+        return draw_seeds(*args)
+
+    monkeypatch.setattr(sweep, "_draw_seeds", interrupted_draw_seeds)
+    with pytest.raises(KeyboardInterrupt):
+        compute_sweep(cells, params, {Quantity.SIGNALING: Cache("S", root=tmp_path)}, Manifest(tmp_path / "sweep.manifest.jsonl"))
+
+    manifest = Manifest(tmp_path / "sweep.manifest.jsonl")
+    assert manifest.finished(cells[0].key(), 20, None) is not None
+    assert manifest.finished(cells[1].key(), 20, None) is None
+
+    calls.clear()
+    cache = Cache("S", root=tmp_path)
+    resumed = compute_sweep(cells, params, {Quantity.SIGNALING: cache}, manifest)
+    assert sum(calls) == 10  # only the unfinished seeds are drawn
+    assert cache.hits + cache.misses == 20  # the finished cell is not looked up in the cache
+    assert [s.mean for s in resumed] == [s.mean for s in expected]
+
+
+def test_manifest_does_not_finish_cells_cut_short_by_the_time_budget(tmp_path, monkeypatch):
+    import expected_signaling_probability.utils.sweep as sweep
+
+    cells = [SweepCell(Quantity.SIGNALING, 2, 2, Direction.A_TO_B, 20)]
+    params = ComputeParams(batch_size=5, sample_retention=SampleRetention.HISTOGRAM)
+    budgeted = replace(params, time_budget=0.0, min_samples=5)
+    manifest = Manifest(tmp_path / "sweep.manifest.jsonl")
+    assert compute_sweep(cells, budgeted, {Quantity.SIGNALING: Cache("S", root=tmp_path)}, manifest)[0].n == 5
+    assert manifest.finished(cells[0].key(), 20, None) is None
+    assert manifest.finished(cells[0].key(), 20, None, 0.0).n == 5
+
+    draw_seeds, calls = sweep._draw_seeds, []
+    monkeypatch.setattr(sweep, "_draw_seeds", lambda *args: calls.append(len(args[2])) or draw_seeds(*args))
+    completed = compute_sweep(cells, params, {Quantity.SIGNALING: Cache("S", root=tmp_path)}, Manifest(tmp_path / "sweep.manifest.jsonl"))
+    assert completed[0].n == 20 and sum(calls) == 15
+
+
+def test_finished_cells_come_from_the_summary_index(tmp_path, monkeypatch):
+    import expected_signaling_probability.utils.sweep as sweep
+
+    params = ComputeParams(batch_size=5, sample_retention=SampleRetention.HISTOGRAM)
+    caches = {Quantity.SIGNALING: Cache("S", root=tmp_path), Quantity.TRANSMISSION: Cache("T", root=tmp_path)}
+    saves = []
+    monkeypatch.setattr(Cache, "_save_index", lambda cache, save=Cache._save_index: saves.append(cache.label) or save(cache))
+    expected = compute_sweep(CELLS, params, caches)
+    assert sorted(saves) == ["S", "T"]  # each index is written once per sweep, not once per cell
+
+    monkeypatch.setattr(sweep, "_draw_seeds", lambda *_: pytest.fail("seeds were drawn"))
+    caches = {Quantity.SIGNALING: Cache("S", root=tmp_path), Quantity.TRANSMISSION: Cache("T", root=tmp_path)}
+    indexed = compute_sweep(CELLS, params, caches)
+    assert all(cache.hits + cache.misses == 0 for cache in caches.values())
+    assert [s.to_dict() for s in indexed] == [s.to_dict() for s in expected]